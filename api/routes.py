@@ -1,12 +1,71 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from lead_generation.core import generate_leads
-from lead_generation.schemas import LeadGenerationRequest, LeadGenerationResponse
+from lead_generation.core import (
+    BatchQuery,
+    generate_leads_async,
+    generate_leads_batch_async,
+    generate_leads_stream,
+    iter_batch_lead_rows,
+    iter_lead_rows,
+    warm_up,
+)
+from lead_generation.jobs import FINISHED_STATUSES, JobQueueFullError, job_manager
+from lead_generation.lead_store import lead_store
+from lead_generation.schemas import (
+    BatchLeadGenerationRequest,
+    BatchLeadGenerationResponse,
+    JobResponse,
+    LeadGenerationRequest,
+    LeadGenerationResponse,
+    LeadSearchResponse,
+)
+from lead_generation.services.search_service import SearchService
+from lead_generation.utils.circuit_breaker import CircuitBreaker
+from lead_generation.utils.data_formatter import LEAD_COLUMNS
+from lead_generation.utils.http_client import HttpClient
+from lead_generation.utils.lead_exporter import LeadExporter
+from lead_generation.utils.metrics import Metrics
+from lead_generation.utils.rate_limiter import HostRateLimiter
+from config.settings import settings
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterable, List, Literal, Optional
+import threading
 import traceback
+import json
+import time
 import os
 
+ExportFormat = Literal["csv", "ndjson", "parquet"]
+
+
+def _export_response(
+    rows: AsyncIterable[dict], fmt: str, compress: bool, stem: str, columns: Optional[List[str]] = None
+) -> StreamingResponse:
+    if fmt == "parquet" and not LeadExporter.parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires the pyarrow package")
+    return StreamingResponse(
+        LeadExporter.export(rows, fmt, compress, columns),
+        media_type=LeadExporter.media_type(fmt, compress),
+        headers={"Content-Disposition": f'attachment; filename="{LeadExporter.filename(stem, fmt, compress)}"'},
+    )
+
+
+def _batch_queries(request: BatchLeadGenerationRequest) -> List[BatchQuery]:
+    return [(item.query, item.num_links, item.top_k, item.use_llm) for item in request.requests]
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    if settings.WARMUP_ON_STARTUP:
+        # In the background, so the app answers (e.g. /health) while it runs
+        threading.Thread(target=warm_up, name="leadfinder-warm-up", daemon=True).start()
+    yield
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="Lead Generation API")
+    app = FastAPI(title="Lead Generation API", lifespan=_lifespan)
 
     # CORS configuration - allow Vercel and local development
     allowed_origins = [
@@ -41,10 +100,42 @@ def create_app() -> FastAPI:
     async def health_check():
         return {"status": "healthy"}
 
+    @app.get("/stats/http")
+    async def http_pool_stats():
+        return HttpClient.pool_stats()
+
+    @app.get("/stats/search-cache")
+    async def search_cache_stats():
+        return SearchService.cache_stats()
+
+    @app.get("/stats/search-sources")
+    async def search_source_stats():
+        return SearchService.source_stats()
+
+    @app.get("/stats/circuits")
+    async def circuit_stats():
+        return CircuitBreaker.stats()
+
+    @app.get("/stats/rate-limits")
+    async def rate_limit_stats():
+        return HostRateLimiter.stats()
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        """Stage, source and extraction latency histograms plus fallback counters, in Prometheus text format."""
+        return PlainTextResponse(Metrics.render(), media_type="text/plain; version=0.0.4")
+
     @app.post("/generate-leads", response_model=LeadGenerationResponse)
     async def create_lead_generation(request: LeadGenerationRequest):
         try:
-            result = generate_leads(request.query, request.num_links)
+            result = await generate_leads_async(
+                request.query,
+                request.num_links,
+                request.include_timing,
+                request.top_k,
+                request.budget_seconds,
+                request.use_llm,
+            )
             
             if not result:
                 # Return empty results instead of 404
@@ -56,4 +147,108 @@ def create_app() -> FastAPI:
             traceback.print_exc()
             raise HTTPException(status_code=500, detail=str(e))
 
+    @app.post("/generate-leads/stream")
+    async def stream_lead_generation(request: LeadGenerationRequest):
+        """Stream pipeline events as NDJSON: query, urls per source, leads as extracted, final summary."""
+        async def ndjson():
+            async for event in generate_leads_stream(
+                request.query, request.num_links, request.top_k, request.budget_seconds, request.use_llm
+            ):
+                yield json.dumps(event) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    @app.post("/generate-leads/export")
+    async def export_lead_generation(
+        request: LeadGenerationRequest,
+        fmt: ExportFormat = Query("csv", alias="format"),
+        gzip: bool = False,
+    ):
+        """Run the pipeline and stream its leads as a file while URLs are being extracted."""
+        rows = iter_lead_rows(request.query, request.num_links, request.top_k, request.budget_seconds, request.use_llm)
+        return _export_response(rows, fmt, gzip, "leads")
+
+    @app.post("/generate-leads/batch", response_model=BatchLeadGenerationResponse)
+    async def create_lead_generation_batch(request: BatchLeadGenerationRequest):
+        if len(request.requests) > settings.BATCH_MAX_QUERIES:
+            raise HTTPException(
+                status_code=422, detail=f"A batch may contain at most {settings.BATCH_MAX_QUERIES} queries"
+            )
+        try:
+            return await generate_leads_batch_async(_batch_queries(request), request.top_k)
+        except Exception as e:
+            print(f"Error: {e}")
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @app.post("/generate-leads/batch/export")
+    async def export_lead_generation_batch(
+        request: BatchLeadGenerationRequest,
+        fmt: ExportFormat = Query("csv", alias="format"),
+        gzip: bool = False,
+    ):
+        """Run a batch and stream every query's leads as one file, with a leading Query column."""
+        if len(request.requests) > settings.BATCH_MAX_QUERIES:
+            raise HTTPException(
+                status_code=422, detail=f"A batch may contain at most {settings.BATCH_MAX_QUERIES} queries"
+            )
+        rows = iter_batch_lead_rows(_batch_queries(request), request.top_k)
+        return _export_response(rows, fmt, gzip, "leads-batch", ["Query", *LEAD_COLUMNS])
+
+    @app.get("/leads/search", response_model=LeadSearchResponse)
+    def search_leads(
+        q: str = "",
+        source: str = "",
+        post_type: str = "",
+        confidence: str = "",
+        min_score: int = 0,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        days: Optional[float] = Query(None, gt=0, description="only leads seen in the last N days"),
+        order: Literal["relevance", "recent", "confidence"] = "relevance",
+        limit: int = Query(20, ge=1, le=100),
+        offset: int = Query(0, ge=0),
+    ):
+        """Search every lead generated so far (local full-text index; no network calls)."""
+        since_ts = since.timestamp() if since else None
+        if days is not None:
+            since_ts = max(since_ts or 0.0, time.time() - days * 86400)
+        return lead_store.search(
+            q, source, post_type, confidence, min_score, since_ts, until.timestamp() if until else None,
+            order, limit, offset,
+        )
+
+    @app.post("/jobs", response_model=JobResponse, status_code=202)
+    async def create_job(request: LeadGenerationRequest):
+        try:
+            job = job_manager.submit(
+                request.query, request.num_links, request.top_k, request.budget_seconds, request.use_llm
+            )
+        except JobQueueFullError as e:
+            raise HTTPException(status_code=429, detail=str(e))
+        return job.to_dict()
+
+    @app.get("/jobs/{job_id}", response_model=JobResponse)
+    async def get_job(job_id: str):
+        job = job_manager.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
+    @app.get("/jobs/{job_id}/export")
+    async def export_job(job_id: str, fmt: ExportFormat = Query("csv", alias="format"), gzip: bool = False):
+        job = job_manager.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if job["status"] not in FINISHED_STATUSES:
+            raise HTTPException(status_code=409, detail=f"Job is {job['status']}; export it once it has finished")
+        return _export_response(LeadExporter.iter_rows(job["user_data"]), fmt, gzip, f"leads-{job_id}")
+
+    @app.delete("/jobs/{job_id}", response_model=JobResponse)
+    async def cancel_job(job_id: str):
+        job = job_manager.cancel(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
     return app
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""
+Offline end-to-end benchmark for the lead pipeline.
+
+Starts the stub services from benchmarks/stub_services.py, points the
+pipeline at them through config.settings, then measures latency percentiles
+and throughput for generate_leads() and for POST /generate-leads under
+concurrent load:
+
+    python benchmarks/bench_pipeline.py --requests 40 --concurrency 8 \\
+        --latency-ms 40 --jitter-ms 20 --set firecrawl.latency_ms=400 --set openai.error_rate=0.05
+
+Every request uses a distinct query so caches don't hide pipeline cost;
+pass --repeat-query to measure the warm-cache path instead.
+"""
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_services import StubProfile, StubServices  # noqa: E402
+
+TOPICS = [
+    "AI customer support chatbots for e-commerce stores",
+    "voice cloning for audiobook narration",
+    "inventory forecasting for small retailers",
+    "HR onboarding automation software",
+]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def report(name: str, latencies: List[float], failures: int, wall: float) -> None:
+    ms = [latency * 1000 for latency in latencies]
+    print(
+        f"{name:<22}{len(latencies):>6}{failures:>8}"
+        f"{percentile(ms, 50):>10.1f}{percentile(ms, 95):>10.1f}{percentile(ms, 99):>10.1f}"
+        f"{len(latencies) / wall:>10.2f}"
+    )
+
+
+def queries(count: int, repeat_query: bool, offset: int = 0) -> List[str]:
+    return [
+        f"Find leads for {TOPICS[i % len(TOPICS)]}" + ("" if repeat_query else f" {offset + i}")
+        for i in range(count)
+    ]
+
+
+def bench_generate_leads(query_list: List[str], num_links: int, concurrency: int) -> Tuple[List[float], int, float]:
+    from lead_generation.core import generate_leads
+
+    def run(query: str) -> Tuple[float, bool]:
+        started = time.perf_counter()
+        result = generate_leads(query, num_links)
+        return time.perf_counter() - started, bool(result and result["user_data"])
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(run, query_list))
+    wall = time.perf_counter() - started
+    return [latency for latency, _ in outcomes], sum(1 for _, ok in outcomes if not ok), wall
+
+
+def bench_http(query_list: List[str], num_links: int, concurrency: int) -> Tuple[List[float], int, float]:
+    import httpx
+    import uvicorn
+    from api.routes import create_app
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(create_app(), host="127.0.0.1", port=port, log_level="error"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    async def run_all() -> Tuple[List[Tuple[float, bool]], float]:
+        limit = asyncio.Semaphore(concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=300) as client:
+            async def run(query: str) -> Tuple[float, bool]:
+                async with limit:
+                    started = time.perf_counter()
+                    response = await client.post("/generate-leads", json={"query": query, "num_links": num_links})
+                    ok = response.status_code == 200 and bool(response.json().get("user_data"))
+                    return time.perf_counter() - started, ok
+
+            started = time.perf_counter()
+            outcomes = await asyncio.gather(*(run(query) for query in query_list))
+            return outcomes, time.perf_counter() - started
+
+    try:
+        outcomes, wall = asyncio.run(run_all())
+    finally:
+        server.should_exit = True
+        thread.join()
+    return [latency for latency, _ in outcomes], sum(1 for _, ok in outcomes if not ok), wall
+
+
+def parse_profiles(args: argparse.Namespace) -> Dict[str, StubProfile]:
+    profiles = {"default": StubProfile(args.latency_ms, args.jitter_ms, args.error_rate)}
+    for override in args.set:
+        key, value = override.split("=", 1)
+        service, field = key.split(".", 1)
+        if service not in profiles:
+            base = profiles["default"]
+            profiles[service] = StubProfile(base.latency_ms, base.jitter_ms, base.error_rate, base.max_rps)
+        setattr(profiles[service], field, float(value))
+    return profiles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--num-links", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=30.0, help="default stub latency")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="default stub jitter (+/-)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="default fraction of 503 responses")
+    parser.add_argument(
+        "--set", action="append", default=[], metavar="SERVICE.FIELD=VALUE",
+        help="per-service override; services: openai, firecrawl, duckduckgo, pages; "
+             "fields: latency_ms, jitter_ms, error_rate, max_rps (429 above this rate)",
+    )
+    parser.add_argument("--repeat-query", action="store_true", help="reuse the same few queries (warm caches)")
+    parser.add_argument("--scenario", choices=["all", "generate_leads", "http"], default="all")
+    parser.add_argument("--verbose", action="store_true", help="keep pipeline print output")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ.setdefault("FIRECRAWL_API_KEY", "fc-benchmark")
+
+    with StubServices(parse_profiles(args)) as stubs:
+        from config.settings import settings
+
+        for key, value in stubs.settings_overrides().items():
+            setattr(settings, key, value)
+        settings.PAGE_CACHE_PATH = ""
+        settings.SEARCH_STATS_PATH = ""
+        # Benchmark leads must not end up in (or be slowed down by) the real lead index
+        settings.LEAD_STORE_PATH = ""
+
+        scenarios: List[Tuple[str, Callable]] = []
+        if args.scenario in ("all", "generate_leads"):
+            scenarios.append(("generate_leads", bench_generate_leads))
+        if args.scenario in ("all", "http"):
+            scenarios.append(("POST /generate-leads", bench_http))
+
+        print(f"{'scenario':<22}{'reqs':>6}{'failed':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+        for position, (name, bench) in enumerate(scenarios):
+            query_list = queries(args.requests, args.repeat_query, offset=position * args.requests)
+            output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+            with output:
+                latencies, failures, wall = bench(query_list, args.num_links, args.concurrency)
+            report(name, latencies, failures, wall)
+
+        from lead_generation.utils.rate_limiter import HostRateLimiter
+
+        throttled = {host: stats for host, stats in HostRateLimiter.stats().items() if stats["throttled_responses"]}
+        if throttled:
+            print(f"\n{'throttled host':<22}{'429/503':>8}{'rate/s':>10}{'concurrency':>13}")
+            for host, stats in sorted(throttled.items()):
+                print(f"{host:<22}{stats['throttled_responses']:>8}{stats['rate']:>10.1f}{stats['concurrency']:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Micro-benchmark: full BeautifulSoup parse vs. the byte-capped incremental
+parser used by ExtractionService in SCRAPE_FAST_MODE.
+
+Each saved page in benchmarks/fixtures is padded with filler markup to
+simulate multi-megabyte Reddit/LinkedIn pages, then parsed both ways.
+
+    python benchmarks/bench_scraping.py --pad-kb 2048 --repeat 20
+"""
+import os
+import sys
+import time
+import codecs
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings  # noqa: E402
+from lead_generation.services.extraction_service import ExtractionService  # noqa: E402
+from lead_generation.utils.page_parser import PageSummaryParser  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FIXTURE_URLS = {
+    "reddit_thread.html": "https://www.reddit.com/r/ecommerce/comments/xyz789/looking_for_an_ai_chatbot/",
+    "linkedin_profile.html": "https://www.linkedin.com/in/priya-raman-cx",
+    "github_repo.html": "https://github.com/acme-labs/voice-clone-studio",
+}
+FILLER = (
+    '<div class="comment"><a href="/user/someone/">u/someone</a>'
+    "<p>Filler reply text that stands in for the long tail of a busy thread.</p></div>\n"
+)
+CHUNK_SIZE = 64 * 1024
+
+
+def pad(html: str, pad_kb: int, position: str) -> str:
+    filler = FILLER * (pad_kb * 1024 // len(FILLER))
+    if position == "head":
+        filler = f"<script>/*{filler}*/</script>"
+        return html.replace("</head>", filler + "</head>", 1)
+    return html.replace("</body>", filler + "</body>", 1)
+
+
+def parse_full(url: str, body: bytes) -> list:
+    return ExtractionService._parse_page(url, body.decode("utf-8", errors="replace"))
+
+
+def parse_fast(url: str, body: bytes) -> tuple:
+    parser = PageSummaryParser()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    received = 0
+    for start in range(0, len(body), CHUNK_SIZE):
+        chunk = body[start:start + CHUNK_SIZE][:settings.SCRAPE_MAX_BYTES - received]
+        received += len(chunk)
+        if parser.feed(decoder.decode(chunk)) or received >= settings.SCRAPE_MAX_BYTES:
+            break
+    return ExtractionService._parse_summary(url, parser.close()), received, parser.backend
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--pad-kb", type=int, default=2048, help="filler added to each fixture, in KiB")
+    arg_parser.add_argument("--position", choices=["body", "head"], default="body", help="where the filler goes")
+    arg_parser.add_argument("--repeat", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    print(f"SCRAPE_MAX_BYTES={settings.SCRAPE_MAX_BYTES}  filler={args.pad_kb} KiB in <{args.position}>")
+    print(f"{'fixture':<24}{'size KiB':>10}{'full ms':>10}{'fast ms':>10}{'read KiB':>10}{'speedup':>9}  same fields  backend")
+    for name, url in FIXTURE_URLS.items():
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+            body = pad(f.read(), args.pad_kb, args.position).encode("utf-8")
+
+        full = parse_full(url, body)[0]
+        fast, received, backend = parse_fast(url, body)
+        same = all(full[field] == fast[0][field] for field in ("bio", "links", "title", "confidence_score"))
+
+        full_ms = timed(lambda: parse_full(url, body), args.repeat)
+        fast_ms = timed(lambda: parse_fast(url, body), args.repeat)
+        print(
+            f"{name:<24}{len(body) / 1024:>10.0f}{full_ms:>10.2f}{fast_ms:>10.2f}"
+            f"{received / 1024:>10.0f}{full_ms / fast_ms:>8.1f}x  {str(same):<11}  {backend}"
+        )
+
+
+if __name__ == "__main__":
+    main()
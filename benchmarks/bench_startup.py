@@ -0,0 +1,105 @@
+"""
+Cold-start benchmark: how long a fresh interpreter takes to import the app and
+answer GET /health, and where the import time goes.
+
+Each run starts a new Python process with `-X importtime`, imports main, builds
+the app and calls /health; the reports are medians over the runs:
+
+    python benchmarks/bench_startup.py --repeat 5 --top 15 --warm-up
+
+--warm-up also times core.warm_up(), i.e. the imports deferred to the first
+request (or to WARMUP_ON_STARTUP); the module tables then include those too.
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_PARTY = ("main", "api", "config", "lead_generation")
+
+PROBE = """
+import json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+TestClient(main.app).get("/health").raise_for_status()
+timings = {"import": imported - started, "health": time.perf_counter() - started}
+if WARM_UP:
+    from lead_generation.core import warm_up
+    warm_started = time.perf_counter()
+    warm_up()
+    timings["warm_up"] = time.perf_counter() - warm_started
+print("TIMINGS " + json.dumps(timings))
+"""
+
+
+def run_probe(warm_up: bool) -> Tuple[Dict[str, float], Dict[str, Tuple[float, float]]]:
+    """One cold start: (phase timings, module -> (self seconds, cumulative seconds))."""
+    env = {**os.environ, "LEAD_STORE_PATH": "", "WARMUP_ON_STARTUP": "false"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"WARM_UP = {warm_up}\n{PROBE}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    timings = {}
+    for line in result.stdout.splitlines():
+        if line.startswith("TIMINGS "):
+            timings = json.loads(line[len("TIMINGS "):])
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.setdefault(name.strip(), (int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return timings, modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters to start")
+    parser.add_argument("--top", type=int, default=15, help="rows per table")
+    parser.add_argument("--warm-up", action="store_true", help="also time core.warm_up() after /health")
+    args = parser.parse_args()
+
+    phases: Dict[str, List[float]] = defaultdict(list)
+    self_times: Dict[str, List[float]] = defaultdict(list)
+    cumulative_times: Dict[str, List[float]] = defaultdict(list)
+    for _ in range(args.repeat):
+        timings, modules = run_probe(args.warm_up)
+        for phase, seconds in timings.items():
+            phases[phase].append(seconds)
+        for name, (self_seconds, cumulative_seconds) in modules.items():
+            self_times[name].append(self_seconds)
+            cumulative_times[name].append(cumulative_seconds)
+
+    print(f"{'phase':<34}{'median ms':>12}{'min ms':>10}")
+    labels = {"import": "import main", "health": "import + first GET /health", "warm_up": "core.warm_up()"}
+    for phase, values in phases.items():
+        print(f"{labels.get(phase, phase):<34}{statistics.median(values) * 1000:>12.1f}{min(values) * 1000:>10.1f}")
+
+    # Project modules by cumulative time: what each of our imports pulls in
+    first_party = [name for name in cumulative_times if name.split(".")[0] in FIRST_PARTY]
+    first_party.sort(key=lambda name: statistics.median(cumulative_times[name]), reverse=True)
+    print(f"\n{'module (cumulative)':<50}{'median ms':>12}{'self ms':>10}")
+    for name in first_party[:args.top]:
+        cumulative, own = statistics.median(cumulative_times[name]), statistics.median(self_times[name])
+        print(f"{name:<50}{cumulative * 1000:>12.1f}{own * 1000:>10.1f}")
+
+    # Every import's own time, summed per top-level package
+    packages: Dict[str, float] = defaultdict(float)
+    for name, values in self_times.items():
+        packages[name.split(".")[0]] += statistics.median(values)
+    print(f"\n{'package (self time)':<50}{'median ms':>12}")
+    for name, seconds in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{name:<50}{seconds * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
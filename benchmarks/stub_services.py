@@ -0,0 +1,247 @@
+"""
+Local stand-ins for every external service the pipeline calls, so benchmarks
+run offline and repeatably:
+
+- OpenAI chat completions (query transform)
+- Firecrawl search and extract
+- DuckDuckGo HTML search (generic and site: queries)
+- Quora search
+- one page server per platform, replaying the saved pages in benchmarks/fixtures
+
+Each service gets its own port (so per-host pools and limits behave as they
+would against real hosts) and its own latency / jitter / error-rate profile.
+"""
+import os
+import sys
+import collections
+import json
+import time
+import random
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+PAGE_SITES = ["linkedin.com", "reddit.com", "twitter.com", "github.com", "stackoverflow.com", "quora.com", "example.com"]
+SITE_FIXTURES = {
+    "linkedin.com": "linkedin_profile.html",
+    "github.com": "github_repo.html",
+}
+DEFAULT_FIXTURE = "reddit_thread.html"
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients hang up on purpose (deadlines, early stops, byte caps)
+        if not issubclass(sys.exc_info()[0], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StubProfile:
+    """
+    Latency (ms), uniform jitter (+/- ms), the fraction of requests answered with
+    a 503, and an optional requests-per-second cap above which requests get a
+    429 with Retry-After.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0, max_rps: float = 0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.max_rps = max_rps
+        self._recent = collections.deque()
+        self._lock = threading.Lock()
+
+    def admit(self) -> bool:
+        """False when the request would exceed max_rps over the last second."""
+        if not self.max_rps:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and now - self._recent[0] > 1.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.max_rps:
+                return False
+            self._recent.append(now)
+            return True
+
+    def delay(self) -> float:
+        return max(0.0, self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+
+    def fails(self) -> bool:
+        return random.random() < self.error_rate
+
+
+Response = Tuple[int, str, bytes]
+
+
+def _json(payload: dict) -> Response:
+    return 200, "application/json", json.dumps(payload).encode()
+
+
+def _html(body: str) -> Response:
+    return 200, "text/html; charset=utf-8", body.encode()
+
+
+def _slug(text: str, salt: str) -> str:
+    return hashlib.sha1(f"{salt}:{text}".encode()).hexdigest()[:10]
+
+
+class StubServices:
+    """Start all stub servers on free local ports; use as a context manager."""
+
+    def __init__(self, profiles: Optional[Dict[str, StubProfile]] = None, links_per_search: int = 6):
+        self.profiles = profiles or {}
+        self.links_per_search = links_per_search
+        self.urls: Dict[str, str] = {}
+        self._servers = []
+        self._extract_jobs: Dict[str, list] = {}
+        self._pages = {}
+        for name in os.listdir(FIXTURES_DIR):
+            with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+                self._pages[name] = f.read()
+
+    def profile(self, service: str) -> StubProfile:
+        return self.profiles.get(service) or self.profiles.get("default") or StubProfile()
+
+    def start(self) -> "StubServices":
+        self.urls["openai"] = self._serve("openai", self._openai)
+        self.urls["firecrawl"] = self._serve("firecrawl", self._firecrawl)
+        self.urls["duckduckgo"] = self._serve("duckduckgo", self._duckduckgo)
+        for site in PAGE_SITES:
+            self.urls[site] = self._serve("pages", lambda method, path, body, site=site: self._page(site, path))
+        return self
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+    def __enter__(self) -> "StubServices":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def settings_overrides(self) -> Dict[str, str]:
+        """Settings that point SearchService, ExtractionService and PromptTransformer at the stubs."""
+        return {
+            "OPENAI_BASE_URL": f"{self.urls['openai']}/v1",
+            "FIRECRAWL_API_URL": self.urls["firecrawl"],
+            "DUCKDUCKGO_HTML_URL": f"{self.urls['duckduckgo']}/html/",
+            # The Quora fallback only keeps URLs containing "quora.com"
+            "QUORA_BASE_URL": f"{self.urls['quora.com']}/quora.com",
+        }
+
+    def _serve(self, service: str, handle: Callable[[str, str, bytes], Response]) -> str:
+        stubs = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self._respond("GET")
+
+            def do_POST(self):
+                self._respond("POST")
+
+            def _respond(self, method):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                profile = stubs.profile(service)
+                headers = {}
+                if not profile.admit():
+                    status, content_type, payload = 429, "text/plain", b"rate limited"
+                    headers["Retry-After"] = "1"
+                else:
+                    time.sleep(profile.delay())
+                    if profile.fails():
+                        status, content_type, payload = 503, "text/plain", b"stub failure"
+                    else:
+                        status, content_type, payload = handle(method, self.path, body)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        server = _StubServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self._servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    def _openai(self, method: str, path: str, body: bytes) -> Response:
+        request = json.loads(body or b"{}")
+        prompt = next((m.get("content") or "" for m in reversed(request.get("messages", [])) if m.get("role") == "user"), "")
+        numbered = [line for line in prompt.splitlines() if line[:1].isdigit() and ". " in line]
+        if numbered:
+            content = "\n".join(f"{line.split('. ', 1)[0]}. {self._describe(line.split('. ', 1)[1])}" for line in numbered)
+        else:
+            content = self._describe(prompt.rsplit(":", 1)[-1])
+        return _json({
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o-mini"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 50, "completion_tokens": 6, "total_tokens": 56},
+        })
+
+    @staticmethod
+    def _describe(query: str) -> str:
+        words = [w for w in query.replace('"', "").split() if w.lower() not in {"find", "leads", "for", "people", "the"}]
+        return " ".join(words[:4]) or "software services"
+
+    def _firecrawl(self, method: str, path: str, body: bytes) -> Response:
+        if path.startswith("/v1/search"):
+            query = json.loads(body or b"{}").get("query", "")
+            limit = json.loads(body or b"{}").get("limit", 3)
+            return _json({"success": True, "data": [
+                {"url": f"{self.urls['example.com']}/example.com/post/{_slug(query, str(i))}"} for i in range(limit)
+            ]})
+        # Both the v1 and v2 extract APIs (firecrawl-py 4.x uses /v2)
+        if path.startswith(("/v1/extract", "/v2/extract")) and method == "POST":
+            urls = json.loads(body or b"{}").get("urls", [])
+            job_id = _slug(" ".join(urls), "extract")
+            self._extract_jobs[job_id] = urls
+            return _json({"success": True, "id": job_id})
+        if path.startswith(("/v1/extract/", "/v2/extract/")):
+            urls = self._extract_jobs.pop(path.rsplit("/", 1)[-1], [])
+            return _json({"success": True, "status": "completed", "data": {"interactions": [
+                {
+                    "username": f"user-{_slug(url, 'user')}",
+                    "bio": "Looking for recommendations on tools for our team.",
+                    "post_type": "question",
+                    "timestamp": "",
+                    "upvotes": 3,
+                    "links": [url],
+                    "source_url": url,
+                }
+                for url in urls
+            ]}})
+        return 404, "application/json", b'{"success": false}'
+
+    def _duckduckgo(self, method: str, path: str, body: bytes) -> Response:
+        query = parse_qs(body.decode()).get("q", [""])[0]
+        site = query[5:].split(" ", 1)[0] if query.startswith("site:") else "example.com"
+        base = self.urls.get(site, self.urls["example.com"])
+        links = "\n".join(
+            f'<a class="result__a" href="{base}/{site}/result/{_slug(query, str(i))}">Result {i}</a>'
+            for i in range(self.links_per_search)
+        )
+        return _html(f"<html><body>{links}</body></html>")
+
+    def _page(self, site: str, path: str) -> Response:
+        if urlparse(path).path.endswith("/search"):
+            query = parse_qs(urlparse(path).query).get("q", [""])[0]
+            links = "\n".join(f'<a href="/What-is-{_slug(query, str(i))}">Q{i}</a>' for i in range(5))
+            return _html(f"<html><body>{links}</body></html>")
+        return _html(self._pages[SITE_FIXTURES.get(site, DEFAULT_FIXTURE)])
@@ -1,11 +1,22 @@
 import os
+from typing import Dict
+from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# The one place .env is loaded: services read API keys from os.environ
+load_dotenv()
+
 class Settings(BaseSettings):
     # API Keys
     OPENAI_API_KEY: str = os.getenv('OPENAI_API_KEY', '')
     FIRECRAWL_API_KEY: str = os.getenv('FIRECRAWL_API_KEY', '')
 
+    # External service endpoints (override to point at local stubs, e.g. benchmarks/stub_services.py)
+    FIRECRAWL_API_URL: str = 'https://api.firecrawl.dev'
+    DUCKDUCKGO_HTML_URL: str = 'https://duckduckgo.com/html/'
+    QUORA_BASE_URL: str = 'https://www.quora.com'
+    OPENAI_BASE_URL: str = ''
+
     # Application Settings
     API_HOST: str = '0.0.0.0'
     API_PORT: int = 8000
@@ -16,6 +27,141 @@ class Settings(BaseSettings):
     SEARCH_LANGUAGE: str = 'en'
     SEARCH_LOCATION: str = 'United States'
 
+    # Shared outbound HTTP client (timeouts in seconds)
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 10.0
+    FIRECRAWL_READ_TIMEOUT: float = 30.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = True
+
+    # Query transform cache (in-process LRU, plus an optional on-disk store)
+    TRANSFORM_CACHE_SIZE: int = 512
+    TRANSFORM_CACHE_TTL_SECONDS: float = 3600.0
+    TRANSFORM_CACHE_PATH: str = ''
+
+    # Query transform mode: 'llm' (gpt-4o-mini) or 'local' (keyword extractor, no network call);
+    # local mode still asks the LLM when its confidence is below TRANSFORM_LOCAL_MIN_CONFIDENCE
+    TRANSFORM_MODE: str = 'llm'
+    TRANSFORM_LOCAL_MIN_CONFIDENCE: float = 0.75
+
+    # Heavy dependencies (phi/openai, BeautifulSoup, Firecrawl) load on first use; set
+    # WARMUP_ON_STARTUP to load them and open the local stores in the background at startup
+    WARMUP_ON_STARTUP: bool = False
+
+    # Batch endpoint: queries per request and per batched transform call
+    BATCH_MAX_QUERIES: int = 200
+    TRANSFORM_BATCH_SIZE: int = 25
+
+    # Run all search sources concurrently and stop waiting after the deadline
+    SEARCH_PARALLEL: bool = True
+    SEARCH_DEADLINE_SECONDS: float = 15.0
+
+    # Per-source search result cache with stale-while-revalidate
+    SEARCH_CACHE_SIZE: int = 1024
+    SEARCH_CACHE_TTL_SECONDS: float = 900.0
+    SEARCH_CACHE_STALE_SECONDS: float = 3600.0
+
+    # Adaptive source scheduling: rolling per-source stats order and skip sources,
+    # and the search stops once max(num_links * 3, 10) unique URLs are collected
+    SEARCH_ADAPTIVE: bool = True
+    SEARCH_STATS_PATH: str = '.leadfinder/search_stats.sqlite'
+    SEARCH_STATS_ALPHA: float = 0.2
+    SEARCH_STATS_MIN_SAMPLES: int = 5
+    SEARCH_SKIP_MIN_UNIQUE: float = 0.25
+    SEARCH_EXPLORE_RATE: float = 0.1
+    SEARCH_FANOUT_MARGIN: float = 1.5
+
+    # Circuit breakers per external endpoint: open after CIRCUIT_FAILURE_RATIO of the
+    # last CIRCUIT_WINDOW calls failed or ran slower than the endpoint's slow-call limit
+    CIRCUIT_WINDOW: int = 20
+    CIRCUIT_MIN_CALLS: int = 5
+    CIRCUIT_FAILURE_RATIO: float = 0.5
+    CIRCUIT_OPEN_SECONDS: float = 30.0
+    CIRCUIT_HALF_OPEN_PROBES: int = 1
+    CIRCUIT_SLOW_CALL_SECONDS: Dict[str, float] = {
+        'firecrawl-search': 10.0,
+        'firecrawl-extract': 45.0,
+        'duckduckgo': 5.0,
+    }
+
+    # Hedged DuckDuckGo requests: race a duplicate once a call runs past this latency percentile
+    DUCKDUCKGO_HEDGE_ENABLED: bool = False
+    DUCKDUCKGO_HEDGE_PERCENTILE: float = 95.0
+    DUCKDUCKGO_HEDGE_MIN_SAMPLES: int = 20
+
+    # Adaptive per-host rate limiting for outbound HTTP (token bucket + concurrency, AIMD):
+    # healthy responses add RATE_LIMIT_INCREASE req/s, 429/503 and CAPTCHA/block pages multiply rate and concurrency by RATE_LIMIT_DECREASE
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_INITIAL_RATE: float = 20.0
+    RATE_LIMIT_MIN_RATE: float = 0.2
+    RATE_LIMIT_MAX_RATE: float = 100.0
+    RATE_LIMIT_BURST: int = 20
+    RATE_LIMIT_INCREASE: float = 0.5
+    RATE_LIMIT_DECREASE: float = 0.5
+    RATE_LIMIT_INITIAL_CONCURRENCY: int = 16
+    RATE_LIMIT_MAX_CONCURRENCY: int = 64
+    RATE_LIMIT_MAX_WAIT_SECONDS: float = 5.0
+    RATE_LIMIT_MAX_RETRY_AFTER: float = 120.0
+
+    # Extract URLs concurrently, bounded globally and per host
+    EXTRACTION_PARALLEL: bool = True
+    EXTRACTION_MAX_WORKERS: int = 8
+    EXTRACTION_PER_HOST_LIMIT: int = 2
+    # URLs sent per Firecrawl extract call (page-cache misses are batched)
+    FIRECRAWL_EXTRACT_BATCH_SIZE: int = 10
+
+    # Local BM25 re-ranking of leads against the query and company description;
+    # rows are ordered by RERANK_WEIGHT * relevance + (1 - RERANK_WEIGHT) * confidence
+    RERANK_ENABLED: bool = True
+    RERANK_WEIGHT: float = 0.5
+    RERANK_BM25_K1: float = 1.2
+    RERANK_BM25_B: float = 0.75
+
+    # Optional per-request latency budget (budget_seconds): each stage gets its share of
+    # the time left, relative to the stages still to run; stragglers are cancelled
+    BUDGET_STAGE_SHARES: Dict[str, float] = {
+        "transform": 0.15,
+        "search": 0.35,
+        "extract": 0.5,
+    }
+
+    # Coalesce identical in-flight lead queries, searches and URL extractions onto one call
+    SINGLE_FLIGHT_ENABLED: bool = True
+
+    # Streaming lead exports: rows encoded per chunk (one Parquet row group each)
+    EXPORT_CHUNK_ROWS: int = 500
+    EXPORT_GZIP_LEVEL: int = 6
+
+    # Local lead store with a full-text index, searched by /leads/search (set to '' to disable)
+    LEAD_STORE_PATH: str = '.leadfinder/leads.sqlite'
+
+    # Background job API (set JOB_STORE_DIR to also keep finished jobs on disk);
+    # POST /jobs answers 429 while JOB_MAX_PENDING jobs are queued or running
+    JOB_MAX_WORKERS: int = 4
+    JOB_MAX_RETAINED: int = 200
+    JOB_MAX_PENDING: int = 100
+    JOB_STORE_DIR: str = ''
+
+    # Scraping: stream pages into an incremental parser and stop at the byte cap
+    SCRAPE_FAST_MODE: bool = True
+    SCRAPE_MAX_BYTES: int = 512 * 1024
+
+    # Persistent page-extraction cache (set PAGE_CACHE_PATH to '' to disable)
+    PAGE_CACHE_PATH: str = '.leadfinder/page_cache.sqlite'
+    PAGE_CACHE_MAX_ENTRIES: int = 5000
+    PAGE_CACHE_TTL_SECONDS: float = 86400.0
+    PAGE_CACHE_DOMAIN_TTLS: Dict[str, float] = {
+        'reddit.com': 3600.0,
+        'twitter.com': 1800.0,
+        'x.com': 1800.0,
+        'quora.com': 21600.0,
+        'stackoverflow.com': 21600.0,
+        'github.com': 43200.0,
+        'linkedin.com': 604800.0,
+    }
+
     # Optional: Load from .env file
     model_config = SettingsConfigDict(env_file='.env', env_file_encoding='utf-8')
 
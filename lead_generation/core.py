@@ -1,8 +1,26 @@
 from .services.prompt_transformer import PromptTransformer
 from .services.search_service import SearchService
 from .services.extraction_service import ExtractionService
+from .lead_store import lead_store
 from .utils.data_formatter import DataFormatter
-from typing import Optional, Dict, Any, List
+from .utils.http_client import HttpClient
+from .utils.latency_budget import LatencyBudget
+from .utils.metrics import Metrics
+from .utils.single_flight import SingleFlight
+from .utils.url_canonicalizer import UrlCanonicalizer
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
+import asyncio
+import importlib
+import time
+
+# Loaded on first use rather than at import; warm_up() loads them ahead of time
+LAZY_MODULES = ("httpx", "openai", "phi.agent", "phi.model.openai", "bs4", "firecrawl")
+
+# Identical (normalized query, num_links, top_k, budget, use_llm) requests in flight share one pipeline run
+_pipeline_flight = SingleFlight("generate_leads")
+
+# One batch entry: (query, num_links, top_k or None for the batch-wide one, use_llm)
+BatchQuery = Tuple[str, int, Optional[int], bool]
 
 
 def _placeholder_leads_from_urls(urls: List[str]) -> List[dict]:
@@ -23,35 +41,301 @@ def _placeholder_leads_from_urls(urls: List[str]) -> List[dict]:
     return placeholders
 
 
-def generate_leads(user_query: str, num_links: int = 3) -> Optional[Dict[str, Any]]:
+def warm_up() -> None:
+    """
+    Pay the first request's one-off costs ahead of time: import the lazily
+    loaded dependencies and open the lead store. Blocking; run it in a thread.
+    """
+    started = time.perf_counter()
+    for name in LAZY_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            print(f"Warm-up could not import {name}: {e}")
+    lead_store.count()
+    print(f"Warm-up finished in {time.perf_counter() - started:.2f}s")
+
+
+async def _store_leads(rows: List[dict], user_query: str) -> None:
+    """Keep the leads in the local lead store; a store failure never fails the pipeline."""
+    try:
+        await asyncio.to_thread(lead_store.upsert, rows, user_query)
+    except Exception as e:
+        print(f"Could not store leads: {e}")
+
+
+def generate_leads(
+    user_query: str,
+    num_links: int = 3,
+    top_k: Optional[int] = None,
+    budget_seconds: Optional[float] = None,
+    use_llm: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """Synchronous wrapper around generate_leads_async (must not be called from a running event loop)."""
+    return HttpClient.run_sync(
+        generate_leads_async(user_query, num_links, top_k=top_k, budget_seconds=budget_seconds, use_llm=use_llm)
+    )
+
+
+async def generate_leads_async(
+    user_query: str,
+    num_links: int = 3,
+    include_timing: bool = False,
+    top_k: Optional[int] = None,
+    budget_seconds: Optional[float] = None,
+    use_llm: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    Run the pipeline to completion. With include_timing the result also carries
+    a "timing" breakdown: seconds per stage plus every source and URL span.
+    With budget_seconds the run returns within roughly that time, with whatever
+    leads were ready; "partial" and "cut_off" then say what was dropped.
+    use_llm makes the query transform use the LLM even in the local TRANSFORM_MODE.
+    Callers asking for the same normalized query while it runs wait on that run
+    (and share its timing) instead of starting their own.
+    """
+    key = (PromptTransformer._normalize_query(user_query), num_links, top_k, budget_seconds, use_llm)
+    summary, trace = await _pipeline_flight.do(
+        key, lambda: _run_pipeline(user_query, num_links, top_k, budget_seconds, use_llm)
+    )
+    if include_timing:
+        # A fresh dict: the run's result may still be shared with other callers
+        summary = {**summary, "timing": {
+            "stages": {span["stage"]: span["seconds"] for span in trace if span["metric"] == "stage"},
+            "spans": [span for span in trace if span["metric"] != "stage"],
+        }}
+    return summary
+
+
+async def _run_pipeline(
+    user_query: str,
+    num_links: int,
+    top_k: Optional[int],
+    budget_seconds: Optional[float] = None,
+    use_llm: bool = False,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    summary = {"urls": [], "user_data": []}
+    with Metrics.collect() as trace:
+        async for event in generate_leads_stream(user_query, num_links, top_k, budget_seconds, use_llm):
+            if event["event"] == "summary":
+                summary = {key: value for key, value in event.items() if key != "event"}
+    return summary, trace
+
+
+async def generate_leads_stream(
+    user_query: str,
+    num_links: int = 3,
+    top_k: Optional[int] = None,
+    budget_seconds: Optional[float] = None,
+    use_llm: bool = False,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the pipeline and yield progress events as they happen:
+    "query" once transformed, "urls" per finished search source, "search_complete"
+    with the merged URL list, one "lead" per extracted row (its Relevance Score
+    is None until the ranking), then a final ranked "summary" (preceded by "error" if the pipeline failed). Leads are ranked by
+    relevance to the query and description combined with confidence; with top_k
+    the summary keeps only the k best.
+
+    With budget_seconds each stage gets its BUDGET_STAGE_SHARES share of the time
+    left and whatever is still running when it runs out is cancelled: a slow
+    transform falls back to the raw query, and the summary ranks the leads that
+    did arrive, with "partial" and a "cut_off" of the transform, search sources
+    and URLs that were dropped.
+    """
+    # Stages are timed by hand (not with Metrics.span) because the body yields
+    started = stage_started = time.perf_counter()
+    stage = "transform"
+    budget = LatencyBudget(budget_seconds) if budget_seconds is not None else None
+    cut_off = {"transform": False, "sources": [], "urls": []}
     try:
         # Transform query
-        company_description = PromptTransformer.transform_query(user_query)
+        outcome = "success"
+        if budget is None:
+            company_description = await PromptTransformer.transform_query_async(user_query, use_llm)
+        else:
+            try:
+                company_description = await asyncio.wait_for(
+                    PromptTransformer.transform_query_async(user_query, use_llm), budget.allot(stage)
+                )
+            except asyncio.TimeoutError:
+                print("Transform budget ran out; searching with the raw query")
+                company_description, outcome = user_query, "timeout"
+                cut_off["transform"] = True
         print(f"Transformed query: {company_description}")
+        Metrics.record("stage", time.perf_counter() - stage_started, outcome, stage=stage)
+        yield {"event": "query", "company_description": company_description}
 
         # Search URLs
-        urls = SearchService.search_for_urls(company_description, num_links)
+        stage, stage_started = "search", time.perf_counter()
+        search_seconds = budget.allot(stage) if budget else None
+        results = {}
+        async for source, source_urls in SearchService.iter_source_results(
+            company_description, num_links, search_seconds, cut_off["sources"]
+        ):
+            results[source] = source_urls
+            yield {"event": "urls", "source": source, "urls": source_urls}
+        merge_seconds = None
+        if budget:
+            merge_seconds = max(0.0, search_seconds - (time.perf_counter() - stage_started))
+        urls = await SearchService.merge_source_results(
+            company_description, num_links, results, merge_seconds, cut_off["sources"]
+        )
         print(f"Found URLs: {urls}")
+        outcome = "timeout" if cut_off["sources"] else "success" if urls else "empty"
+        Metrics.record("stage", time.perf_counter() - stage_started, outcome, stage=stage)
+        yield {"event": "search_complete", "urls": urls}
 
         if not urls:
             # Return empty result instead of None
-            return {"urls": [], "user_data": []}
+            Metrics.record("stage", time.perf_counter() - started, "empty", stage="total")
+            yield {"event": "summary", "urls": [], "user_data": [], **_cut_off_fields(budget, cut_off)}
+            return
 
-        # Extract user info
-        user_info_list = ExtractionService.extract_user_info_from_urls(urls)
-        print(f"Extracted {len(user_info_list)} user info entries")
+        # Extract user info; with a budget, URLs still extracting when it runs out are cancelled
+        stage, stage_started = "extract", time.perf_counter()
+        user_info_list = [None] * len(urls)
+        extractions = ExtractionService.iter_extractions(urls)
+        async for index, info in LatencyBudget.iter_within(extractions, budget.allot(stage) if budget else None):
+            user_info_list[index] = info
+            for lead in DataFormatter.format_unranked(info):
+                yield {"event": "lead", "lead": lead}
+        cut_off["urls"] = [url for url, info in zip(urls, user_info_list) if info is None]
+        if cut_off["urls"]:
+            print(f"Extraction budget ran out; {len(cut_off['urls'])} URLs cut off")
+        print(f"Extracted {len(user_info_list) - len(cut_off['urls'])} user info entries")
+        Metrics.record("stage", time.perf_counter() - stage_started, "timeout" if cut_off["urls"] else "success", stage=stage)
 
         # Format data
-        flattened_data = DataFormatter.format_user_info_to_json(user_info_list)
+        flattened_data = DataFormatter.format_user_info_to_json(
+            [info for info in user_info_list if info is not None], user_query, company_description, top_k
+        )
 
         # If we still have no data, create placeholders so UI can show something
         if not flattened_data:
+            Metrics.inc("placeholder_fallback", len(urls), stage="pipeline")
             flattened_data = _placeholder_leads_from_urls(urls)
+        else:
+            await _store_leads(flattened_data, user_query)
 
-        return {
-            "urls": urls,
-            "user_data": flattened_data
-        }
+        Metrics.record("stage", time.perf_counter() - started, stage="total")
+        yield {"event": "summary", "urls": urls, "user_data": flattened_data, **_cut_off_fields(budget, cut_off)}
     except Exception as e:
         print(f"Error in generate_leads: {e}")
-        return {"urls": [], "user_data": []}
\ No newline at end of file
+        Metrics.record("stage", time.perf_counter() - stage_started, Metrics.classify(e), stage=stage)
+        Metrics.record("stage", time.perf_counter() - started, "failure", stage="total")
+        yield {"event": "error", "detail": str(e)}
+        yield {"event": "summary", "urls": [], "user_data": []}
+
+
+def _cut_off_fields(budget: Optional[LatencyBudget], cut_off: Dict[str, Any]) -> Dict[str, Any]:
+    """Summary fields of a budgeted run (none without a budget)."""
+    if budget is None:
+        return {}
+    if cut_off["transform"]:
+        Metrics.inc("budget_cut_offs", stage="transform")
+    if cut_off["sources"]:
+        Metrics.inc("budget_cut_offs", len(cut_off["sources"]), stage="search")
+    if cut_off["urls"]:
+        Metrics.inc("budget_cut_offs", len(cut_off["urls"]), stage="extract")
+    partial = cut_off["transform"] or bool(cut_off["sources"]) or bool(cut_off["urls"])
+    return {"partial": partial, "cut_off": cut_off}
+
+
+async def iter_lead_rows(
+    user_query: str,
+    num_links: int = 3,
+    top_k: Optional[int] = None,
+    budget_seconds: Optional[float] = None,
+    use_llm: bool = False,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Lead rows of a live pipeline run, yielded as each URL is extracted (so in
+    extraction order, not ranked or scored for relevance). Placeholder rows are yielded at the end if
+    extraction produced nothing. With top_k the k best rows of the final
+    ranking are yielded instead, once extraction has finished.
+    """
+    streamed = 0
+    async for event in generate_leads_stream(user_query, num_links, top_k, budget_seconds, use_llm):
+        if event["event"] == "lead" and top_k is None:
+            streamed += 1
+            yield event["lead"]
+        elif event["event"] == "summary" and not streamed:
+            for row in event["user_data"]:
+                yield row
+
+
+async def iter_batch_lead_rows(queries: List[BatchQuery], top_k: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Lead rows of a batch run, each prefixed with the "Query" that found it."""
+    batch = await generate_leads_batch_async(queries, top_k)
+    for result in batch["results"]:
+        for row in result["user_data"]:
+            yield {"Query": result["query"], **row}
+
+
+async def generate_leads_batch_async(queries: List[BatchQuery], top_k: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run many (query, num_links, top_k, use_llm) entries as one batch: queries are
+    transformed in as few LLM calls as possible, searches run concurrently, and
+    every unique URL is extracted once then fanned back out to each query that
+    found it. An entry's own top_k takes precedence over the batch-wide one.
+    """
+    started = time.perf_counter()
+    descriptions = await PromptTransformer.transform_queries_async(
+        [query for query, *_ in queries], [use_llm for *_, use_llm in queries]
+    )
+    transformed = time.perf_counter()
+
+    async def search(description: Optional[str], num_links: int) -> List[str]:
+        if not description:
+            return []
+        try:
+            return await SearchService.search_for_urls_async(description, num_links)
+        except Exception as e:
+            print(f"Batch search failed for {description!r}: {e}")
+            return []
+
+    url_lists = await asyncio.gather(*(
+        search(description, num_links) for description, (_, num_links, *_) in zip(descriptions, queries)
+    ))
+    searched = time.perf_counter()
+
+    unique_urls, collapsed_urls = SearchService.collapse_urls([url for urls in url_lists for url in urls])
+    user_infos = await ExtractionService.extract_user_info_from_urls_async(unique_urls)
+    user_info_by_key = {UrlCanonicalizer.key(url): info for url, info in zip(unique_urls, user_infos)}
+    extracted = time.perf_counter()
+
+    results = []
+    for (query, _, query_top_k, _), description, urls in zip(queries, descriptions, url_lists):
+        user_data = DataFormatter.format_user_info_to_json(
+            [user_info_by_key[UrlCanonicalizer.key(url)] for url in urls],
+            query,
+            description or "",
+            query_top_k if query_top_k is not None else top_k,
+        )
+        if urls and not user_data:
+            Metrics.inc("placeholder_fallback", len(urls), stage="pipeline")
+            user_data = _placeholder_leads_from_urls(urls)
+        else:
+            await _store_leads(user_data, query)
+        results.append({
+            "query": query,
+            "company_description": description or "",
+            "urls": urls,
+            "user_data": user_data,
+        })
+
+    total_urls = sum(len(urls) for urls in url_lists)
+    print(f"Batch of {len(queries)} queries: {total_urls} URLs, {len(unique_urls)} unique extractions")
+    return {
+        "results": results,
+        "timing": {
+            "transform_seconds": transformed - started,
+            "search_seconds": searched - transformed,
+            "extraction_seconds": extracted - searched,
+            "total_seconds": time.perf_counter() - started,
+            "total_urls": total_urls,
+            "unique_urls": len(unique_urls),
+            "collapsed_urls": collapsed_urls,
+        },
+    }
@@ -0,0 +1,231 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from config.settings import settings
+from .core import generate_leads_stream
+from .utils.http_client import HttpClient
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+class JobQueueFullError(Exception):
+    """Raised by JobManager.submit while max_pending jobs are queued or running."""
+
+
+class Job:
+    """State of one background lead-generation run, updated as pipeline events arrive."""
+
+    def __init__(
+        self,
+        query: str,
+        num_links: int,
+        top_k: Optional[int] = None,
+        budget_seconds: Optional[float] = None,
+        use_llm: bool = False,
+    ):
+        self.id = uuid.uuid4().hex
+        self.query = query
+        self.num_links = num_links
+        self.top_k = top_k
+        self.budget_seconds = budget_seconds
+        self.use_llm = use_llm
+        self.status = "queued"
+        self.stage = "queued"
+        self.urls: List[str] = []
+        self.urls_found = 0
+        self.urls_extracted = 0
+        self.user_data: List[dict] = []
+        self.error: Optional[str] = None
+        self.partial = False
+        self.cut_off: Optional[Dict[str, Any]] = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.cancel_requested = threading.Event()
+        self.future: Optional[Future] = None
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def apply_event(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            kind = event["event"]
+            if kind == "query":
+                self.stage = "searching"
+            elif kind == "urls":
+                self.urls_found += len(event["urls"])
+            elif kind == "search_complete":
+                self.stage = "extracting"
+                self.urls = event["urls"]
+                self.urls_found = len(event["urls"])
+            elif kind == "lead":
+                self.user_data.append(event["lead"])
+                self.urls_extracted = len({lead["Website URL"] for lead in self.user_data})
+            elif kind == "error":
+                self.error = event["detail"]
+            elif kind == "summary":
+                self.urls = event["urls"]
+                self.user_data = event["user_data"]
+                self.urls_extracted = len(event["urls"])
+                self.partial = event.get("partial", False)
+                self.cut_off = event.get("cut_off")
+            self.updated_at = time.time()
+
+    def set_status(self, status: str, stage: Optional[str] = None) -> None:
+        with self._lock:
+            self.status = status
+            if stage is not None:
+                self.stage = stage
+            self.updated_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "stage": self.stage,
+                "query": self.query,
+                "num_links": self.num_links,
+                "urls_found": self.urls_found,
+                "urls_extracted": self.urls_extracted,
+                "urls": list(self.urls),
+                "user_data": list(self.user_data),
+                "error": self.error,
+                "partial": self.partial,
+                "cut_off": self.cut_off,
+                "created_at": self.created_at,
+                "updated_at": self.updated_at,
+            }
+
+
+class JobManager:
+    """
+    Runs lead-generation jobs on a bounded worker pool. Job state is kept in a
+    bounded in-memory store (oldest finished jobs are evicted first) and, when
+    `store_dir` is set, finished jobs are also written there as JSON. Unfinished
+    jobs are never evicted, so new ones are refused once `max_pending` are
+    queued or running.
+    """
+
+    def __init__(self, max_workers: int, max_retained: int, store_dir: str = "", max_pending: int = 100):
+        self.max_workers = max_workers
+        self.max_retained = max_retained
+        self.store_dir = store_dir
+        self.max_pending = max_pending
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def submit(
+        self,
+        query: str,
+        num_links: int,
+        top_k: Optional[int] = None,
+        budget_seconds: Optional[float] = None,
+        use_llm: bool = False,
+    ) -> Job:
+        job = Job(query, num_links, top_k, budget_seconds, use_llm)
+        with self._lock:
+            pending = sum(1 for queued in self._jobs.values() if not queued.finished)
+            if pending >= self.max_pending:
+                raise JobQueueFullError(f"{pending} jobs are already queued or running; try again later")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+            self._jobs[job.id] = job
+            self._evict()
+            job.future = self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        return self._load(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return self._load(job_id)
+        if not job.finished:
+            job.cancel_requested.set()
+            if job.future is not None and job.future.cancel():
+                # Never started, so the worker won't get to mark it
+                job.set_status("cancelled", "cancelled")
+                self._save(job)
+        return job.to_dict()
+
+    def _run(self, job: Job) -> None:
+        if job.cancel_requested.is_set():
+            job.set_status("cancelled", "cancelled")
+        else:
+            job.set_status("running", "transforming")
+            try:
+                HttpClient.run_sync(self._run_async(job))
+            except Exception as e:
+                print(f"Job {job.id} failed: {e}")
+                job.apply_event({"event": "error", "detail": str(e)})
+                job.set_status("failed", "failed")
+        self._save(job)
+
+    async def _run_async(self, job: Job) -> None:
+        async def consume():
+            async for event in generate_leads_stream(
+                job.query, job.num_links, job.top_k, job.budget_seconds, job.use_llm
+            ):
+                job.apply_event(event)
+
+        task = asyncio.ensure_future(consume())
+        while not task.done():
+            await asyncio.wait({task}, timeout=0.2)
+            if job.cancel_requested.is_set() and not task.done():
+                task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            job.set_status("cancelled", "cancelled")
+            return
+        job.set_status("failed" if job.error else "completed", "done")
+
+    def _evict(self) -> None:
+        """Drop the oldest finished jobs once more than max_retained are held."""
+        excess = len(self._jobs) - self.max_retained
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished][:excess]:
+            del self._jobs[job_id]
+
+    def _save(self, job: Job) -> None:
+        if not self.store_dir:
+            return
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            with open(os.path.join(self.store_dir, f"{job.id}.json"), "w", encoding="utf-8") as f:
+                json.dump(job.to_dict(), f)
+        except Exception as e:
+            print(f"Could not persist job {job.id}: {e}")
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if not self.store_dir or not job_id.isalnum():
+            return None
+        try:
+            with open(os.path.join(self.store_dir, f"{job_id}.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Could not load job {job_id}: {e}")
+            return None
+
+
+job_manager = JobManager(
+    settings.JOB_MAX_WORKERS, settings.JOB_MAX_RETAINED, settings.JOB_STORE_DIR, settings.JOB_MAX_PENDING
+)
@@ -0,0 +1,230 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from config.settings import settings
+from .utils.data_formatter import LEAD_COLUMNS
+
+PLACEHOLDER_USERNAME = "Potential Lead"
+
+# Lead row column -> SQLite column ("Confidence Score" -> confidence_score)
+COLUMN_MAP = {name: name.lower().replace(" ", "_") for name in LEAD_COLUMNS}
+INTEGER_COLUMNS = ("Upvotes", "Confidence Score", "Relevance Score")
+SORT_ORDERS = {
+    "relevance": "rank, leads.confidence_score DESC, leads.last_seen DESC",
+    "recent": "leads.last_seen DESC",
+    "confidence": "leads.confidence_score DESC, leads.last_seen DESC",
+}
+# bm25 column weights, in leads_fts column order: title, bio, snippet, username, source
+BM25_WEIGHTS = "5.0, 1.0, 1.0, 3.0, 2.0"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    id INTEGER PRIMARY KEY,
+    website_url TEXT NOT NULL,
+    username TEXT NOT NULL,
+    bio TEXT NOT NULL DEFAULT '',
+    post_type TEXT NOT NULL DEFAULT '',
+    timestamp TEXT NOT NULL DEFAULT '',
+    upvotes INTEGER NOT NULL DEFAULT 0,
+    links TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT '',
+    snippet TEXT NOT NULL DEFAULT '',
+    confidence TEXT NOT NULL DEFAULT '',
+    confidence_score INTEGER NOT NULL DEFAULT 0,
+    relevance_score INTEGER NOT NULL DEFAULT 0,
+    title TEXT NOT NULL DEFAULT '',
+    query TEXT NOT NULL DEFAULT '',
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    UNIQUE (website_url, username)
+);
+CREATE INDEX IF NOT EXISTS leads_last_seen ON leads (last_seen);
+CREATE INDEX IF NOT EXISTS leads_source ON leads (source);
+CREATE VIRTUAL TABLE IF NOT EXISTS leads_fts USING fts5(
+    title, bio, snippet, username, source, content='leads', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS leads_ai AFTER INSERT ON leads BEGIN
+    INSERT INTO leads_fts (rowid, title, bio, snippet, username, source)
+    VALUES (new.id, new.title, new.bio, new.snippet, new.username, new.source);
+END;
+CREATE TRIGGER IF NOT EXISTS leads_ad AFTER DELETE ON leads BEGIN
+    INSERT INTO leads_fts (leads_fts, rowid, title, bio, snippet, username, source)
+    VALUES ('delete', old.id, old.title, old.bio, old.snippet, old.username, old.source);
+END;
+CREATE TRIGGER IF NOT EXISTS leads_au AFTER UPDATE ON leads BEGIN
+    INSERT INTO leads_fts (leads_fts, rowid, title, bio, snippet, username, source)
+    VALUES ('delete', old.id, old.title, old.bio, old.snippet, old.username, old.source);
+    INSERT INTO leads_fts (rowid, title, bio, snippet, username, source)
+    VALUES (new.id, new.title, new.bio, new.snippet, new.username, new.source);
+END;
+"""
+
+
+class LeadStore:
+    """
+    Every generated lead, kept in SQLite with an FTS5 index over title, bio,
+    snippet, username and source so past results can be searched without
+    running the pipeline. Rows are upserted by (Website URL, Username);
+    placeholder leads are not stored. The database is opened on first use and,
+    like SQLiteCache, the store disables itself if it can't be opened.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._opened = False
+        self._lock = threading.Lock()
+
+    def upsert(self, rows: List[Dict[str, Any]], query: str = "") -> int:
+        """Insert or refresh lead rows; returns how many were written."""
+        rows = [row for row in rows if row.get("Website URL") and row.get("Username") != PLACEHOLDER_USERNAME]
+        conn = self._connect()
+        if conn is None or not rows:
+            return 0
+        columns = list(COLUMN_MAP.values())
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column not in ("website_url", "username"))
+        now = time.time()
+        values = [
+            (*(LeadStore._column_value(name, row.get(name)) for name in COLUMN_MAP), query, now, now)
+            for row in rows
+        ]
+        with self._lock:
+            conn.executemany(
+                f"INSERT INTO leads ({', '.join(columns)}, query, first_seen, last_seen) "
+                f"VALUES ({', '.join('?' * (len(columns) + 3))}) "
+                f"ON CONFLICT (website_url, username) DO UPDATE SET {updates}, "
+                "query = CASE WHEN excluded.query != '' THEN excluded.query ELSE leads.query END, "
+                "last_seen = excluded.last_seen",
+                values,
+            )
+            conn.commit()
+        return len(values)
+
+    def search(
+        self,
+        text: str = "",
+        source: str = "",
+        post_type: str = "",
+        confidence: str = "",
+        min_score: int = 0,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        order: str = "relevance",
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Filtered, ranked page of stored leads. `text` is matched against the
+        full-text index (every word must appear, porter-stemmed); relevance is
+        BM25 with title and username weighted highest. since/until are epoch
+        seconds compared against when the lead was last seen.
+        """
+        conn = self._connect()
+        empty = {"total": 0, "limit": limit, "offset": offset, "results": []}
+        if conn is None:
+            return empty
+
+        match = LeadStore._match_expression(text)
+        if text and not match:
+            return empty
+        joins, where, params = "", [], []
+        if match:
+            joins = "JOIN leads_fts ON leads_fts.rowid = leads.id"
+            where.append("leads_fts MATCH ?")
+            params.append(match)
+        if source:
+            where.append("leads.source LIKE ?")
+            params.append(f"%{source}%")
+        if post_type:
+            where.append("leads.post_type = ?")
+            params.append(post_type)
+        if confidence:
+            where.append("leads.confidence = ?")
+            params.append(confidence)
+        if min_score:
+            where.append("leads.confidence_score >= ?")
+            params.append(min_score)
+        if since is not None:
+            where.append("leads.last_seen >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("leads.last_seen < ?")
+            params.append(until)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        rank = f"bm25(leads_fts, {BM25_WEIGHTS})" if match else "0"
+        order_by = SORT_ORDERS["recent" if order == "relevance" and not match else order]
+
+        with self._lock:
+            total = conn.execute(f"SELECT COUNT(*) FROM leads {joins} {clause}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT leads.*, {rank} AS rank FROM leads {joins} {clause} ORDER BY {order_by} LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return {"total": total, "limit": limit, "offset": offset, "results": [LeadStore._to_lead(row) for row in rows]}
+
+    def count(self) -> int:
+        conn = self._connect()
+        if conn is None:
+            return 0
+        with self._lock:
+            return conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        # Unlocked fast path: _opened is only set once _conn holds its final value
+        if self._opened:
+            return self._conn
+        with self._lock:
+            if not self._opened:
+                if self.path:
+                    try:
+                        directory = os.path.dirname(self.path)
+                        if directory:
+                            os.makedirs(directory, exist_ok=True)
+                        conn = sqlite3.connect(self.path, check_same_thread=False)
+                        conn.row_factory = sqlite3.Row
+                        conn.executescript(SCHEMA)
+                        LeadStore._add_missing_columns(conn)
+                        self._conn = conn
+                    except Exception as e:
+                        print(f"Lead store {self.path} unavailable: {e}")
+                self._opened = True
+        return self._conn
+
+    @staticmethod
+    def _add_missing_columns(conn: sqlite3.Connection) -> None:
+        """Stores created before a lead column existed get it added with an empty default."""
+        existing = {row["name"] for row in conn.execute("PRAGMA table_info(leads)")}
+        for name, column in COLUMN_MAP.items():
+            if column not in existing:
+                kind = "INTEGER NOT NULL DEFAULT 0" if name in INTEGER_COLUMNS else "TEXT NOT NULL DEFAULT ''"
+                conn.execute(f"ALTER TABLE leads ADD COLUMN {column} {kind}")
+        conn.commit()
+
+    @staticmethod
+    def _match_expression(text: str) -> str:
+        """Quote each word so user input can't break FTS5 query syntax."""
+        return " ".join(f'"{word}"' for word in re.findall(r"\w+", text or ""))
+
+    @staticmethod
+    def _column_value(name: str, value: Any) -> Any:
+        if name in INTEGER_COLUMNS:
+            try:
+                return int(value or 0)
+            except (TypeError, ValueError):
+                return 0
+        return "" if value is None else str(value)
+
+    @staticmethod
+    def _to_lead(row: sqlite3.Row) -> Dict[str, Any]:
+        lead = {name: row[column] for name, column in COLUMN_MAP.items()}
+        lead["Query"] = row["query"]
+        lead["First Seen"] = datetime.fromtimestamp(row["first_seen"]).isoformat()
+        lead["Last Seen"] = datetime.fromtimestamp(row["last_seen"]).isoformat()
+        return lead
+
+
+lead_store = LeadStore(settings.LEAD_STORE_PATH)
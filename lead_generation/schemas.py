@@ -1,5 +1,5 @@
-from typing import List
-from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field
 
 class QuoraUserInteractionSchema(BaseModel):
     username: str = Field(description="Username of the user")
@@ -12,10 +12,70 @@ class QuoraUserInteractionSchema(BaseModel):
 class QuoraPageSchema(BaseModel):
     interactions: List[QuoraUserInteractionSchema] = Field(description="User interactions")
 
+class BatchQuoraUserInteractionSchema(QuoraUserInteractionSchema):
+    source_url: str = Field(description="URL of the page this interaction was found on")
+
+class BatchQuoraPageSchema(BaseModel):
+    interactions: List[BatchQuoraUserInteractionSchema] = Field(description="User interactions from all pages")
+
 class LeadGenerationRequest(BaseModel):
     query: str
     num_links: int = 3
+    include_timing: bool = False
+    top_k: Optional[int] = Field(default=None, ge=1, description="Return only the k best-ranked leads")
+    budget_seconds: Optional[float] = Field(
+        default=None, gt=0, description="Latency budget; return the leads ready when it runs out"
+    )
+    use_llm: bool = Field(default=False, description="Transform the query with the LLM even in local TRANSFORM_MODE")
 
 class LeadGenerationResponse(BaseModel):
     urls: List[str]
-    user_data: List[dict]
\ No newline at end of file
+    user_data: List[dict]
+    timing: Optional[dict] = None
+    partial: bool = False
+    cut_off: Optional[dict] = None
+
+class BatchLeadGenerationItem(BaseModel):
+    # No budget_seconds or include_timing: a batch shares its extraction and reports one timing
+    model_config = ConfigDict(extra="forbid")
+
+    query: str
+    num_links: int = 3
+    top_k: Optional[int] = Field(default=None, ge=1, description="Overrides the batch-wide top_k for this query")
+    use_llm: bool = Field(default=False, description="Transform the query with the LLM even in local TRANSFORM_MODE")
+
+class BatchLeadGenerationRequest(BaseModel):
+    requests: List[BatchLeadGenerationItem]
+    top_k: Optional[int] = Field(default=None, ge=1, description="Keep only the k best-ranked leads per query")
+
+class BatchQueryResult(BaseModel):
+    query: str
+    company_description: str
+    urls: List[str]
+    user_data: List[dict]
+
+class BatchLeadGenerationResponse(BaseModel):
+    results: List[BatchQueryResult]
+    timing: Dict[str, Union[int, float]]
+
+class JobResponse(BaseModel):
+    id: str
+    status: str
+    stage: str
+    query: str
+    num_links: int
+    urls_found: int
+    urls_extracted: int
+    urls: List[str]
+    user_data: List[dict]
+    error: Optional[str] = None
+    partial: bool = False
+    cut_off: Optional[dict] = None
+    created_at: float
+    updated_at: float
+
+class LeadSearchResponse(BaseModel):
+    total: int
+    limit: int
+    offset: int
+    results: List[dict]
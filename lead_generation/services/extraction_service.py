@@ -1,138 +1,501 @@
 import os
 import re
-import requests
-from typing import List
+import time
+import codecs
+import asyncio
+import threading
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Dict, List, Optional, Tuple
 from datetime import datetime
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
-from dotenv import load_dotenv
+from config.settings import settings
+from ..utils.cache import SQLiteCache
+from ..utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from ..utils.http_client import HttpClient
+from ..utils.metrics import Metrics
+from ..utils.page_parser import PageSummary, PageSummaryParser
+from ..utils.rate_limiter import BLOCK_SNIFF_CHARS, THROTTLE_STATUSES, BlockedPageError, HostRateLimiter
+from ..utils.single_flight import FlightAbandoned, SingleFlight
+from ..utils.url_canonicalizer import UrlCanonicalizer
 
-load_dotenv()
+if TYPE_CHECKING:
+    import httpx
 
 
 class ExtractionService:
+    _page_cache: Optional[SQLiteCache] = None
+    _firecrawl_app = None
+    _firecrawl_lock = threading.Lock()
+    _extraction_flight = SingleFlight("extraction")
+
     @staticmethod
     def extract_user_info_from_urls(urls: List[str]) -> List[dict]:
-        user_info_list = []
+        """Synchronous wrapper around extract_user_info_from_urls_async (must not be called from a running event loop)."""
+        return HttpClient.run_sync(ExtractionService.extract_user_info_from_urls_async(urls))
 
-        for url in urls:
+    @staticmethod
+    async def extract_user_info_from_urls_async(urls: List[str]) -> List[dict]:
+        """Extract user info for every URL, returned in input order."""
+        user_info_list = [None] * len(urls)
+        async for index, info in ExtractionService.iter_extractions(urls):
+            user_info_list[index] = info
+        return user_info_list
+
+    @staticmethod
+    async def iter_extractions(urls: List[str]) -> AsyncIterator[Tuple[int, dict]]:
+        """
+        Yield (index, user info) as each URL finishes. Equivalent URL variants
+        (see UrlCanonicalizer) and exact duplicates are extracted once, under their
+        canonical URL, and the result is fanned out to every index that named them.
+        URLs another caller is already extracting are awaited rather than fetched again.
+        """
+        canonical_urls: List[str] = []
+        groups: Dict[str, List[int]] = {}
+        for index, url in enumerate(urls):
+            key = UrlCanonicalizer.key(url)
+            if key not in groups:
+                groups[key] = []
+                canonical_urls.append(UrlCanonicalizer.canonicalize(url))
+            groups[key].append(index)
+        if len(urls) > len(canonical_urls):
+            Metrics.inc("urls_collapsed", len(urls) - len(canonical_urls), stage="extraction")
+
+        keys = list(groups)
+        if not settings.SINGLE_FLIGHT_ENABLED:
+            async for position, info in ExtractionService._iter_unique_extractions(canonical_urls):
+                for index in groups[keys[position]]:
+                    yield index, {**info, "website_url": urls[index]}
+            return
+
+        flight = ExtractionService._extraction_flight
+        owned, followed = [], []
+        for position, key in enumerate(keys):
+            future, leader = flight.claim(key)
+            (owned if leader else followed).append((position, future))
+        finished: asyncio.Queue = asyncio.Queue()
+
+        async def extract_owned() -> None:
+            pending = dict(owned)
             try:
-                # Try Firecrawl extraction first
-                extracted = ExtractionService._extract_with_firecrawl(url)
+                positions = [position for position, _ in owned]
+                async for i, info in ExtractionService._iter_unique_extractions([canonical_urls[p] for p in positions]):
+                    position = positions[i]
+                    flight.resolve(keys[position], pending.pop(position), info)
+                    finished.put_nowait((position, info))
+            except Exception as e:
+                print(f"Extraction failed: {e}")
+                for position in list(pending):
+                    finished.put_nowait((position, ExtractionService._placeholder_info(canonical_urls[position])))
+            finally:
+                # Anything left unresolved (cancelled or failed) is handed back to its followers
+                for position, future in pending.items():
+                    flight.release(keys[position], future)
+
+        async def follow(position: int, future) -> None:
+            try:
+                info = await flight.wait(future)
+            except FlightAbandoned:
+                info = None
+                async for _, info in ExtractionService._iter_unique_extractions([canonical_urls[position]]):
+                    pass
+            except Exception:
+                info = ExtractionService._placeholder_info(canonical_urls[position])
+            finished.put_nowait((position, info))
+
+        tasks = [asyncio.ensure_future(extract_owned())]
+        tasks += [asyncio.ensure_future(follow(position, future)) for position, future in followed]
+        try:
+            for _ in keys:
+                position, info = await finished.get()
+                for index in groups[keys[position]]:
+                    yield index, {**info, "website_url": urls[index]}
+        finally:
+            for task in tasks:
+                task.cancel()
 
-                # Fallback to scraping if Firecrawl fails
-                if not extracted:
-                    extracted = ExtractionService._extract_with_scraping(url)
+    @staticmethod
+    async def _iter_unique_extractions(urls: List[str]) -> AsyncIterator[Tuple[int, dict]]:
+        """
+        Yield (index, user info) as each URL finishes, in three passes:
+        1. the page cache (stale entries are revalidated),
+        2. one Firecrawl extract call per FIRECRAWL_EXTRACT_BATCH_SIZE cache misses,
+        3. scraping for the URLs Firecrawl left empty, then placeholders.
+        With EXTRACTION_PARALLEL enabled up to EXTRACTION_MAX_WORKERS fetches or
+        Firecrawl calls run concurrently, with at most EXTRACTION_PER_HOST_LIMIT
+        concurrent page fetches per host.
+        """
+        parallel = settings.EXTRACTION_PARALLEL and len(urls) > 1
+        global_limit = asyncio.Semaphore(max(1, settings.EXTRACTION_MAX_WORKERS))
+        host_limit = max(1, settings.EXTRACTION_PER_HOST_LIMIT)
+        host_semaphores = {
+            host: asyncio.Semaphore(host_limit)
+            for host in {ExtractionService._get_domain(url) for url in urls}
+        }
+
+        async def fetch(index: int, url: str, method: str) -> Tuple[int, str, List[dict], dict]:
+            # Take the host slot first so a blocked host doesn't hold a global slot
+            validators = {}
+            async with host_semaphores[ExtractionService._get_domain(url)]:
+                async with global_limit:
+                    with Metrics.span("extraction", detail=url, method=method) as span:
+                        try:
+                            if method == "cache":
+                                extracted = await ExtractionService._get_cached_extraction(url)
+                            else:
+                                extracted = await ExtractionService._extract_with_scraping(url, validators)
+                        except Exception as e:
+                            print(f"Extraction failed for {url}: {e}")
+                            Metrics.fail(e)
+                            extracted = []
+                        span.result(extracted)
+            return index, url, extracted, validators
+
+        async def extract_chunk(chunk: List[Tuple[int, str]]) -> Tuple[List[Tuple[int, str]], Dict[str, List[dict]]]:
+            async with global_limit:
+                with Metrics.span("extraction", detail=f"{len(chunk)} URLs", method="firecrawl") as span:
+                    extracted = await ExtractionService._extract_with_firecrawl_batch([url for _, url in chunk])
+                    span.result(extracted)
+            return chunk, extracted
+
+        # 1. Page cache
+        misses = []
+        async for index, url, extracted, _ in ExtractionService._run_all(
+            [fetch(index, url, "cache") for index, url in enumerate(urls)], parallel
+        ):
+            if extracted:
+                yield index, {"website_url": url, "user_info": extracted}
+            else:
+                misses.append((index, url))
+
+        # 2. Batched Firecrawl extract
+        leftovers = []
+        chunk_size = max(1, settings.FIRECRAWL_EXTRACT_BATCH_SIZE)
+        chunks = [misses[start:start + chunk_size] for start in range(0, len(misses), chunk_size)]
+        async for chunk, extracted_by_url in ExtractionService._run_all([extract_chunk(chunk) for chunk in chunks], parallel):
+            for index, url in chunk:
+                extracted = extracted_by_url.get(url)
+                if extracted:
+                    await ExtractionService._store_cached_extraction(url, extracted, {})
+                    yield index, {"website_url": url, "user_info": extracted}
+                else:
+                    leftovers.append((index, url))
+
+        # 3. Scraping fallback, then a minimal placeholder entry so the UI shows something
+        async for index, url, extracted, validators in ExtractionService._run_all(
+            [fetch(index, url, "scrape") for index, url in leftovers], parallel
+        ):
+            if extracted:
+                await ExtractionService._store_cached_extraction(url, extracted, validators)
+            else:
+                Metrics.inc("placeholder_fallback", stage="extraction")
+                extracted = [ExtractionService._placeholder_entry(url)]
+            yield index, {"website_url": url, "user_info": extracted}
 
-                # If still nothing, create a minimal placeholder entry so UI shows something
-                if not extracted:
-                    extracted = [ExtractionService._placeholder_entry(url)]
+    @staticmethod
+    def _placeholder_info(url: str) -> dict:
+        return {"website_url": url, "user_info": [ExtractionService._placeholder_entry(url)]}
 
-                user_info_list.append({
-                    "website_url": url,
-                    "user_info": extracted
-                })
-            except Exception as e:
-                print(f"Extraction failed for {url}: {e}")
-                user_info_list.append({
-                    "website_url": url,
-                    "user_info": [ExtractionService._placeholder_entry(url)]
-                })
+    @staticmethod
+    async def _run_all(coros: List[Awaitable], parallel: bool) -> AsyncIterator:
+        """Yield each coroutine's result: concurrently in completion order, or one by one in order."""
+        if not parallel:
+            pending = list(coros)
+            try:
+                while pending:
+                    yield await pending.pop(0)
+            finally:
+                for coro in pending:
+                    coro.close()
+            return
+
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
 
-        return user_info_list
+    @staticmethod
+    async def _extract_with_firecrawl_batch(urls: List[str]) -> Dict[str, List[dict]]:
+        """Extract several URLs in one Firecrawl call; returns interactions keyed by input URL."""
+        # While the circuit is open, go straight to scraping without a thread hop
+        if CircuitBreaker.get("firecrawl-extract").is_open():
+            Metrics.fail(CircuitOpenError("firecrawl-extract circuit is open"))
+            return {}
+        # The Firecrawl SDK is blocking, so keep it off the event loop
+        return await asyncio.to_thread(ExtractionService._extract_with_firecrawl_batch_blocking, urls)
 
     @staticmethod
-    def _extract_with_firecrawl(url: str) -> List[dict]:
+    def _extract_with_firecrawl_batch_blocking(urls: List[str]) -> Dict[str, List[dict]]:
         try:
-            from firecrawl import FirecrawlApp
-            from ..schemas import QuoraPageSchema
-
-            firecrawl_app = FirecrawlApp(api_key=os.getenv('FIRECRAWL_API_KEY'))
-            response = firecrawl_app.extract(
-                [url],
-                {
-                    'prompt': 'Extract user info from Quora posts',
-                    'schema': QuoraPageSchema.model_json_schema(),
-                }
-            )
-
-            if response.get('success'):
-                interactions = response.get('data', {}).get('interactions', [])
-                if interactions:
-                    return interactions
+            from ..schemas import BatchQuoraPageSchema
+
+            with CircuitBreaker.get("firecrawl-extract").guard():
+                response = ExtractionService._get_firecrawl_app().extract(
+                    urls,
+                    prompt=(
+                        'Extract user info from Quora posts. Set source_url on every interaction '
+                        'to the exact URL of the page it was found on.'
+                    ),
+                    schema=BatchQuoraPageSchema.model_json_schema(),
+                )
+            # The SDK returns a response model; tolerate a plain dict too
+            if not isinstance(response, dict):
+                response = response.model_dump()
+
+            if response.get('success') and response.get('status') in (None, 'completed'):
+                interactions = (response.get('data') or {}).get('interactions', [])
+                return ExtractionService._group_by_source_url(urls, interactions)
         except Exception as e:
             print(f"Firecrawl extraction failed: {e}")
-        return []
+            Metrics.fail(e)
+        return {}
+
+    @staticmethod
+    def _group_by_source_url(urls: List[str], interactions: List[dict]) -> Dict[str, List[dict]]:
+        """Map batched interactions back to the input URLs via their source_url field."""
+        by_key = {UrlCanonicalizer.key(url): url for url in urls}
+        grouped: Dict[str, List[dict]] = {}
+        unmatched = 0
+        for interaction in interactions:
+            source_url = interaction.pop("source_url", None) or ""
+            url = urls[0] if len(urls) == 1 else by_key.get(UrlCanonicalizer.key(source_url))
+            if url is None:
+                unmatched += 1
+                continue
+            grouped.setdefault(url, []).append(interaction)
+        if unmatched:
+            print(f"Firecrawl returned {unmatched} interactions that match none of the {len(urls)} requested URLs")
+        return grouped
+
+    @staticmethod
+    def _get_firecrawl_app():
+        """One FirecrawlApp (and its HTTP session) reused across calls, rebuilt if the key or URL changes."""
+        from firecrawl import FirecrawlApp
+
+        config = (os.getenv('FIRECRAWL_API_KEY'), settings.FIRECRAWL_API_URL)
+        with ExtractionService._firecrawl_lock:
+            if ExtractionService._firecrawl_app is None or ExtractionService._firecrawl_app[0] != config:
+                ExtractionService._firecrawl_app = (config, FirecrawlApp(api_key=config[0], api_url=config[1]))
+            return ExtractionService._firecrawl_app[1]
 
     @staticmethod
-    def _extract_with_scraping(url: str) -> List[dict]:
-        """Fallback extraction using lightweight HTML parsing."""
+    async def _extract_with_scraping(url: str, validators: Optional[dict] = None) -> List[dict]:
+        """
+        Fallback extraction using lightweight HTML parsing. When `validators` is
+        given it is filled with the response's ETag/Last-Modified for the page cache.
+        """
         try:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
-            response = requests.get(url, headers=headers, timeout=10)
+            response, interactions = await ExtractionService._fetch_and_parse(url, headers)
 
             if response.status_code != 200:
+                Metrics.fail(outcome="throttled" if response.status_code in THROTTLE_STATUSES else None)
                 return []
+            if validators is not None:
+                validators.update(ExtractionService._response_validators(response))
+            return interactions
+        except Exception as e:
+            print(f"Scraping failed: {e}")
+            Metrics.fail(e)
+        return []
 
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            title = soup.title.string.strip() if soup.title else "Lead source"
-            meta_desc = ""
-            meta = soup.find("meta", attrs={"name": "description"}) or soup.find("meta", attrs={"property": "og:description"})
-            if meta and meta.get("content"):
-                meta_desc = meta.get("content").strip()
+    @staticmethod
+    async def _fetch_and_parse(url: str, headers: dict) -> Tuple["httpx.Response", List[dict]]:
+        """
+        GET a page and parse it into interactions (empty unless the status is 200).
+        In SCRAPE_FAST_MODE the body is streamed into an incremental parser and the
+        download stops at SCRAPE_MAX_BYTES or as soon as every field is collected.
+        A CAPTCHA or block page (200 or 403) backs the host off in HostRateLimiter
+        and raises BlockedPageError instead of being parsed as content.
+        """
+        if not settings.SCRAPE_FAST_MODE:
+            response = await HttpClient.get(url, headers=headers)
+            ExtractionService._check_blocked(url, response, response.text[:BLOCK_SNIFF_CHARS])
+            if response.status_code != 200:
+                return response, []
+            # Parsing is CPU-bound; run it in a thread so other requests keep flowing
+            return response, await asyncio.to_thread(ExtractionService._parse_page, url, response.text)
+
+        async with HttpClient.stream("GET", url, headers=headers) as response:
+            if response.status_code not in (200, 403):
+                return response, []
+            parser = PageSummaryParser()
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+            head = ""
+            received = 0
+            async for chunk in response.aiter_bytes():
+                chunk = chunk[:settings.SCRAPE_MAX_BYTES - received]
+                received += len(chunk)
+                text = decoder.decode(chunk)
+                head += text[:BLOCK_SNIFF_CHARS - len(head)]
+                if response.status_code != 200:
+                    # A 403 body is only read far enough to tell an interstitial from a plain refusal
+                    if len(head) >= BLOCK_SNIFF_CHARS or received >= settings.SCRAPE_MAX_BYTES:
+                        break
+                elif parser.feed(text) or received >= settings.SCRAPE_MAX_BYTES:
+                    break
+            ExtractionService._check_blocked(url, response, head)
+            if response.status_code != 200:
+                return response, []
+            return response, ExtractionService._parse_summary(url, parser.close())
 
-            # Try to grab some meaningful text from headers/paragraphs
-            header_texts = [h.get_text(strip=True) for h in soup.find_all(["h1", "h2", "h3"], limit=3)]
-            paragraph = soup.find("p")
-            para_text = paragraph.get_text(strip=True) if paragraph else ""
+    @staticmethod
+    def _check_blocked(url: str, response: "httpx.Response", head: str) -> None:
+        """Back off from the host and raise BlockedPageError if the response is a CAPTCHA or block page."""
+        reason = HostRateLimiter.block_reason(response.status_code, response.headers, head)
+        if reason is not None:
+            HostRateLimiter.throttle(HttpClient.rate_key(url), response.headers.get("Retry-After"), reason=reason)
+            raise BlockedPageError(f"{reason} page (HTTP {response.status_code}) from {url}")
 
-            snippet_parts = [meta_desc, *header_texts, para_text]
-            snippet = next((part for part in snippet_parts if part), "" )
-            snippet = snippet[:280] if snippet else "No detailed snippet available."
+    @staticmethod
+    async def _get_cached_extraction(url: str) -> List[dict]:
+        """Return cached interactions for a URL, revalidating stale entries with a conditional GET."""
+        cache = ExtractionService._get_page_cache()
+        if cache is None:
+            return []
+        entry = await asyncio.to_thread(cache.get, url)
+        if entry is None:
+            return []
+
+        record, stored_at = entry
+        if time.time() - stored_at <= ExtractionService._page_cache_ttl(url):
+            return record["interactions"]
+        if not (record.get("etag") or record.get("last_modified")):
+            return []
+
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        if record.get("etag"):
+            headers["If-None-Match"] = record["etag"]
+        if record.get("last_modified"):
+            headers["If-Modified-Since"] = record["last_modified"]
+        try:
+            response, interactions = await ExtractionService._fetch_and_parse(url, headers)
+        except Exception as e:
+            print(f"Revalidation failed for {url}: {e}")
+            Metrics.fail(e)
+            return []
+
+        if response.status_code == 304:
+            # Unchanged: restart the TTL and keep the cached extraction
+            await asyncio.to_thread(cache.set, url, record)
+            return record["interactions"]
+        if response.status_code == 200:
+            await ExtractionService._store_cached_extraction(url, interactions, ExtractionService._response_validators(response))
+            return interactions
+        return []
 
-            # Collect links on the page for context
-            links = []
-            for a in soup.find_all("a", href=True):
-                href = a["href"]
-                if href.startswith("http") and len(links) < 5:
-                    links.append(href)
-            if not links:
-                links = [url]
+    @staticmethod
+    async def _store_cached_extraction(url: str, interactions: List[dict], validators: dict) -> None:
+        cache = ExtractionService._get_page_cache()
+        if cache is not None:
+            await asyncio.to_thread(cache.set, url, {"interactions": interactions, **validators})
 
-            domain = ExtractionService._get_domain(url)
-            post_type = ExtractionService._detect_post_type(url, domain)
-            username = ExtractionService._extract_username_from_url(url)
-
-            # Calculate confidence score based on data quality
-            confidence_score, confidence_label = ExtractionService._calculate_confidence(
-                snippet=snippet,
-                username=username,
-                domain=domain,
-                title=title,
-                meta_desc=meta_desc,
-                links=links
+    @staticmethod
+    def _get_page_cache() -> Optional[SQLiteCache]:
+        if ExtractionService._page_cache is None and settings.PAGE_CACHE_PATH:
+            ExtractionService._page_cache = SQLiteCache(
+                settings.PAGE_CACHE_PATH, table="page_cache", max_entries=settings.PAGE_CACHE_MAX_ENTRIES
             )
+        return ExtractionService._page_cache
 
-            interactions = [{
-                "username": username,
-                "bio": snippet,
-                "post_type": post_type,
-                "timestamp": datetime.now().isoformat(),
-                "upvotes": 0,
-                "links": links,
-                "source": domain,
-                "confidence": confidence_label,
-                "confidence_score": confidence_score,
-                "title": title[:100] if title else ""
-            }]
+    @staticmethod
+    def _page_cache_ttl(url: str) -> float:
+        """TTL for a URL's cache entry, using the most specific PAGE_CACHE_DOMAIN_TTLS match."""
+        domain = (urlparse(url).hostname or "").lower()
+        matches = [
+            suffix for suffix in settings.PAGE_CACHE_DOMAIN_TTLS
+            if domain == suffix or domain.endswith("." + suffix)
+        ]
+        if not matches:
+            return settings.PAGE_CACHE_TTL_SECONDS
+        return settings.PAGE_CACHE_DOMAIN_TTLS[max(matches, key=len)]
 
-            return interactions
-        except Exception as e:
-            print(f"Scraping failed: {e}")
-        return []
+    @staticmethod
+    def _response_validators(response) -> dict:
+        return {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+    @staticmethod
+    def _parse_page(url: str, html: str) -> List[dict]:
+        """Build a single interaction from a page's title, meta description, headings and links."""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, "html.parser")
+
+        title = soup.title.string.strip() if soup.title else "Lead source"
+        meta_desc = ""
+        meta = soup.find("meta", attrs={"name": "description"}) or soup.find("meta", attrs={"property": "og:description"})
+        if meta and meta.get("content"):
+            meta_desc = meta.get("content").strip()
+
+        # Try to grab some meaningful text from headers/paragraphs
+        header_texts = [h.get_text(strip=True) for h in soup.find_all(["h1", "h2", "h3"], limit=3)]
+        paragraph = soup.find("p")
+        para_text = paragraph.get_text(strip=True) if paragraph else ""
+
+        # Collect links on the page for context
+        links = []
+        for a in soup.find_all("a", href=True):
+            href = a["href"]
+            if href.startswith("http") and len(links) < 5:
+                links.append(href)
+
+        return ExtractionService._build_interactions(url, title, meta_desc, header_texts, para_text, links)
+
+    @staticmethod
+    def _parse_summary(url: str, summary: PageSummary) -> List[dict]:
+        """Same as _parse_page, but from fields collected by the incremental PageSummaryParser."""
+        title = summary.title if summary.title is not None else "Lead source"
+        return ExtractionService._build_interactions(
+            url, title, summary.description, summary.headings, summary.paragraph or "", summary.links
+        )
+
+    @staticmethod
+    def _build_interactions(
+        url: str, title: str, meta_desc: str, header_texts: List[str], para_text: str, links: List[str]
+    ) -> List[dict]:
+        snippet_parts = [meta_desc, *header_texts, para_text]
+        snippet = next((part for part in snippet_parts if part), "" )
+        snippet = snippet[:280] if snippet else "No detailed snippet available."
+
+        if not links:
+            links = [url]
+
+        domain = ExtractionService._get_domain(url)
+        post_type = ExtractionService._detect_post_type(url, domain)
+        username = ExtractionService._extract_username_from_url(url)
+
+        # Calculate confidence score based on data quality
+        confidence_score, confidence_label = ExtractionService._calculate_confidence(
+            snippet=snippet,
+            username=username,
+            domain=domain,
+            title=title,
+            meta_desc=meta_desc,
+            links=links
+        )
+
+        interactions = [{
+            "username": username,
+            "bio": snippet,
+            "post_type": post_type,
+            "timestamp": datetime.now().isoformat(),
+            "upvotes": 0,
+            "links": links,
+            "source": domain,
+            "confidence": confidence_label,
+            "confidence_score": confidence_score,
+            "title": title[:100] if title else ""
+        }]
+
+        return interactions
 
     @staticmethod
     def _detect_post_type(url: str, domain: str) -> str:
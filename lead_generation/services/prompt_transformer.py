@@ -1,16 +1,20 @@
 import os
-from phi.agent import Agent
-from phi.model.openai import OpenAIChat
-from dotenv import load_dotenv
+import re
+import time
+import asyncio
+import weakref
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from config.settings import settings
+from ..utils.cache import SQLiteCache, TTLCache
+from ..utils.http_client import HttpClient
+from ..utils.keyword_extractor import KeywordExtractor
+from ..utils.metrics import Metrics
+from ..utils.single_flight import SingleFlight
 
-load_dotenv()
+if TYPE_CHECKING:
+    from phi.model.openai import OpenAIChat
 
-class PromptTransformer:
-    @staticmethod
-    def transform_query(user_query: str) -> str:
-        agent = Agent(
-            model=OpenAIChat(id="gpt-4o-mini", api_key=os.getenv('OPENAI_API_KEY')),
-            system_prompt="""Transform detailed user queries into concise 3-4 word company descriptions.
+SYSTEM_PROMPT = """Transform detailed user queries into concise 3-4 word company descriptions.
 
 Examples:
 Input: "Generate leads for AI-powered customer support chatbots for e-commerce stores."
@@ -19,9 +23,204 @@ Output: "AI customer support chatbots"
 Input: "Find people interested in voice cloning for audiobooks"
 Output: "voice cloning technology"
 
-Always focus on core product/service.""",
-            markdown=True
+Always focus on core product/service."""
+
+
+class PromptTransformer:
+    _memory_cache = TTLCache(settings.TRANSFORM_CACHE_SIZE, settings.TRANSFORM_CACHE_TTL_SECONDS)
+    _disk_cache: Optional[SQLiteCache] = None
+    # One model (and its pooled OpenAI client) per event loop
+    _models: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, OpenAIChat]" = weakref.WeakKeyDictionary()
+    _transform_flight = SingleFlight("transform")
+
+    @staticmethod
+    def transform_query(user_query: str, use_llm: bool = False) -> str:
+        """Synchronous wrapper around transform_query_async (must not be called from a running event loop)."""
+        return HttpClient.run_sync(PromptTransformer.transform_query_async(user_query, use_llm))
+
+    @staticmethod
+    async def transform_query_async(user_query: str, use_llm: bool = False) -> str:
+        """
+        Transform a user query into a 3-4 word description. Results are cached
+        by normalized query in an in-process LRU and, when TRANSFORM_CACHE_PATH
+        is set, in an on-disk store that survives restarts. Concurrent misses for
+        the same normalized query share one LLM call.
+
+        In the 'local' TRANSFORM_MODE the description comes from KeywordExtractor
+        without a network call, unless its confidence is below
+        TRANSFORM_LOCAL_MIN_CONFIDENCE or use_llm is set; if that LLM call fails,
+        the local description is used anyway.
+        """
+        key = PromptTransformer._normalize_query(user_query)
+        with Metrics.span("transform") as span:
+            cached = await PromptTransformer._get_cached(key)
+            if cached is not None:
+                span.outcome = "cached"
+                return cached
+            local = None
+            if settings.TRANSFORM_MODE == "local":
+                local, confident = PromptTransformer._transform_local(user_query, use_llm)
+                if confident:
+                    span.outcome = "local"
+                    return local
+            try:
+                return await PromptTransformer._transform_flight.do(
+                    key, lambda: PromptTransformer._transform_uncached(key, user_query)
+                )
+            except Exception as e:
+                if not local:
+                    raise
+                print(f"LLM query transform failed, using the local description: {e}")
+                Metrics.fail(e)
+                return local
+
+    @staticmethod
+    def _transform_local(user_query: str, use_llm: bool = False) -> Tuple[str, bool]:
+        """(local description, whether it is confident enough to skip the LLM)."""
+        description, confidence = KeywordExtractor.describe(user_query)
+        if use_llm:
+            Metrics.inc("local_transforms", result="requested")
+            return description, False
+        if not description or confidence < settings.TRANSFORM_LOCAL_MIN_CONFIDENCE:
+            Metrics.inc("local_transforms", result="low_confidence")
+            return description, False
+        Metrics.inc("local_transforms", result="answered")
+        return description, True
+
+    @staticmethod
+    async def _transform_uncached(key: str, user_query: str) -> str:
+        from phi.agent import Agent
+
+        agent = Agent(model=PromptTransformer._get_model(), system_prompt=SYSTEM_PROMPT, markdown=True)
+        response = await agent.arun(f"Transform query to 3-4 word description: {user_query}")
+        description = response.content
+        await PromptTransformer._store_cached(key, description)
+        return description
+
+    @staticmethod
+    async def transform_queries_async(
+        user_queries: List[str], use_llm: Optional[List[bool]] = None
+    ) -> List[Optional[str]]:
+        """
+        Transform many queries with as few LLM calls as possible: cached and
+        duplicate queries are resolved locally and the rest are sent in
+        numbered chunks of TRANSFORM_BATCH_SIZE. Queries a chunk fails to answer
+        fall back to transform_query_async; entries are None if that fails too.
+        In the 'local' TRANSFORM_MODE confident local descriptions are used
+        first and only the rest go to the LLM; use_llm flags, one per query,
+        send queries to the LLM regardless.
+        """
+        keys = [PromptTransformer._normalize_query(query) for query in user_queries]
+        use_llm = use_llm or [False] * len(user_queries)
+        resolved: Dict[str, Optional[str]] = {}
+        pending: Dict[str, Tuple[str, bool]] = {}
+        for key, query, query_use_llm in zip(keys, user_queries, use_llm):
+            if key in resolved or key in pending:
+                continue
+            cached = await PromptTransformer._get_cached(key)
+            if cached is not None:
+                resolved[key] = cached
+                continue
+            if settings.TRANSFORM_MODE == "local":
+                local, confident = PromptTransformer._transform_local(query, query_use_llm)
+                if confident:
+                    resolved[key] = local
+                    continue
+            pending[key] = (query, query_use_llm)
+
+        pending_items = list(pending.items())
+        chunk_size = max(1, settings.TRANSFORM_BATCH_SIZE)
+        for start in range(0, len(pending_items), chunk_size):
+            chunk = pending_items[start:start + chunk_size]
+            try:
+                descriptions = await PromptTransformer._transform_chunk([query for _, (query, _) in chunk])
+            except Exception as e:
+                print(f"Batched query transform failed: {e}")
+                descriptions = [None] * len(chunk)
+            for (key, (query, query_use_llm)), description in zip(chunk, descriptions):
+                if description:
+                    await PromptTransformer._store_cached(key, description)
+                else:
+                    try:
+                        description = await PromptTransformer.transform_query_async(query, query_use_llm)
+                    except Exception as e:
+                        print(f"Query transform failed for {query!r}: {e}")
+                        description = None
+                resolved[key] = description
+
+        return [resolved[key] for key in keys]
+
+    @staticmethod
+    async def _transform_chunk(user_queries: List[str]) -> List[Optional[str]]:
+        """One LLM call for several queries; answers are matched back by their line number."""
+        from phi.agent import Agent
+
+        numbered = "\n".join(f"{i}. {query}" for i, query in enumerate(user_queries, 1))
+        agent = Agent(model=PromptTransformer._get_model(), system_prompt=SYSTEM_PROMPT, markdown=False)
+        response = await agent.arun(
+            "Transform each numbered query to a 3-4 word description. "
+            "Reply with one line per query in the form '<number>. <description>' and nothing else.\n\n"
+            f"{numbered}"
         )
-        
-        response = agent.run(f"Transform query to 3-4 word description: {user_query}")
-        return response.content
\ No newline at end of file
+        descriptions: List[Optional[str]] = [None] * len(user_queries)
+        for line in (response.content or "").splitlines():
+            match = re.match(r"\s*(\d+)[.)]\s*(.+)", line)
+            if match and 1 <= int(match.group(1)) <= len(user_queries):
+                descriptions[int(match.group(1)) - 1] = match.group(2).strip().strip('"')
+        return descriptions
+
+    @staticmethod
+    async def _get_cached(key: str) -> Optional[str]:
+        cached = PromptTransformer._memory_cache.get(key)
+        if cached is not None:
+            return cached
+
+        disk_cache = PromptTransformer._get_disk_cache()
+        if disk_cache is not None:
+            entry = await asyncio.to_thread(disk_cache.get, key)
+            if entry is not None and time.time() - entry[1] <= settings.TRANSFORM_CACHE_TTL_SECONDS:
+                PromptTransformer._memory_cache.set(key, entry[0])
+                return entry[0]
+        return None
+
+    @staticmethod
+    async def _store_cached(key: str, description: Optional[str]) -> None:
+        if not description:
+            return
+        PromptTransformer._memory_cache.set(key, description)
+        disk_cache = PromptTransformer._get_disk_cache()
+        if disk_cache is not None:
+            await asyncio.to_thread(disk_cache.set, key, description)
+
+    @staticmethod
+    def _normalize_query(user_query: str) -> str:
+        """Lowercase, drop punctuation and collapse whitespace so trivial variants share a key."""
+        return " ".join(re.sub(r"[^\w\s]", " ", user_query.lower()).split())
+
+    @staticmethod
+    def _get_model() -> "OpenAIChat":
+        # phi and openai take most of the app's import time, so they load on the first LLM call
+        from openai import AsyncOpenAI
+        from phi.model.openai import OpenAIChat
+
+        loop = asyncio.get_running_loop()
+        model = PromptTransformer._models.get(loop)
+        if model is None:
+            api_key = os.getenv('OPENAI_API_KEY')
+            model = OpenAIChat(
+                id="gpt-4o-mini",
+                api_key=api_key,
+                async_client=AsyncOpenAI(
+                    api_key=api_key, base_url=settings.OPENAI_BASE_URL or None, http_client=HttpClient.get_client()
+                ),
+            )
+            PromptTransformer._models[loop] = model
+        return model
+
+    @staticmethod
+    def _get_disk_cache() -> Optional[SQLiteCache]:
+        if PromptTransformer._disk_cache is None and settings.TRANSFORM_CACHE_PATH:
+            PromptTransformer._disk_cache = SQLiteCache(
+                settings.TRANSFORM_CACHE_PATH, table="transform_cache", max_entries=settings.TRANSFORM_CACHE_SIZE * 10
+            )
+        return PromptTransformer._disk_cache
@@ -1,54 +1,430 @@
 import os
-import requests
-from typing import List
-from dotenv import load_dotenv
+import re
+import time
+import random
+import asyncio
+import threading
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from config.settings import settings
+from ..utils.cache import SQLiteCache, TTLCache
+from ..utils.circuit_breaker import CircuitBreaker
+from ..utils.http_client import HttpClient
+from ..utils.metrics import Metrics
+from ..utils.rate_limiter import THROTTLE_STATUSES, BlockedPageError, HostRateLimiter
+from ..utils.single_flight import SingleFlight
+from ..utils.url_canonicalizer import UrlCanonicalizer
 
-load_dotenv()
+if TYPE_CHECKING:
+    import httpx
+
+
+SITE_SOURCES = [
+    "linkedin.com",
+    "reddit.com",
+    "twitter.com",
+    "github.com",
+    "stackoverflow.com",
+    "quora.com",
+]
+
+# Merge priority for search results
+SOURCE_NAMES = ["firecrawl", "generic", *SITE_SOURCES]
 
 
 class SearchService:
+    # Entries live for TTL + stale window; stale ones are served while a refresh runs
+    _result_cache = TTLCache(
+        settings.SEARCH_CACHE_SIZE, settings.SEARCH_CACHE_TTL_SECONDS + settings.SEARCH_CACHE_STALE_SECONDS
+    )
+    _cache_stats: Dict[str, Dict[str, int]] = {}
+    _refreshing: Set[Tuple[str, str, int]] = set()
+    _search_flight = SingleFlight("search")
+    # Rolling per-source stats (EWMA latency, yield and unique contribution), persisted in SEARCH_STATS_PATH
+    _source_stats: Dict[str, Dict[str, float]] = {}
+    _stats_lock = threading.Lock()
+    _stats_store: Optional[SQLiteCache] = None
+    _stats_loaded = False
+    # Sources whose stats changed since they were last written to the store
+    _dirty_sources: Set[str] = set()
+
     @staticmethod
     def search_for_urls(company_description: str, num_links: int = 3) -> List[str]:
+        """Synchronous wrapper around search_for_urls_async (must not be called from a running event loop)."""
+        return HttpClient.run_sync(SearchService.search_for_urls_async(company_description, num_links))
+
+    @staticmethod
+    async def search_for_urls_async(company_description: str, num_links: int = 3) -> List[str]:
         """
-        Aggregate URLs from multiple sources in parallel-ish fashion:
+        Aggregate URLs from multiple sources:
         1. Firecrawl (if API key available)
         2. DuckDuckGo generic (any domain)
         3. DuckDuckGo site-specific: LinkedIn, Reddit, Twitter, GitHub, StackOverflow, Quora
-        Returns deduplicated list up to num_links.
+        With SEARCH_PARALLEL enabled all sources run at once under a single
+        SEARCH_DEADLINE_SECONDS deadline; results are always merged in the
+        priority order above so output stays deterministic.
+        Returns deduplicated list up to max(num_links * 3, 10).
         """
-        all_urls = []
+        results = {}
+        async for source, urls in SearchService.iter_source_results(company_description, num_links):
+            results[source] = urls
+        return await SearchService.merge_source_results(company_description, num_links, results)
 
-        # Try Firecrawl first
-        all_urls.extend(SearchService._search_firecrawl(company_description, num_links))
+    @staticmethod
+    async def iter_source_results(
+        company_description: str,
+        num_links: int = 3,
+        deadline: Optional[float] = None,
+        cut_off: Optional[List[str]] = None,
+    ) -> AsyncIterator[Tuple[str, List[str]]]:
+        """
+        Yield (source, urls) as each search source finishes. Sequential mode
+        yields in priority order; parallel mode yields in completion order and
+        cancels whatever is still running at SEARCH_DEADLINE_SECONDS (or at
+        `deadline` seconds, if sooner; sequential mode only honours `deadline`).
+        Sources cancelled or never started because time ran out are appended to
+        `cut_off`.
 
-        # DuckDuckGo generic search (any domain)
-        all_urls.extend(SearchService._search_duckduckgo_generic(company_description, num_links))
+        With SEARCH_ADAPTIVE, sources run in order of their rolling unique-URLs-per-second
+        score, persistently unproductive ones are skipped, parallel mode only starts as
+        many sources as it expects to need, and the search stops as soon as
+        max(num_links * 3, 10) unique URLs have been collected.
+        """
+        sources = SearchService._plan_sources(SearchService._build_sources(company_description, num_links))
+        adaptive = settings.SEARCH_ADAPTIVE
+        target = max(num_links * 3, 10)
+        collected: Set[str] = set()
+        loop = asyncio.get_running_loop()
+        if not settings.SEARCH_PARALLEL:
+            expires_at = None if deadline is None else loop.time() + deadline
+            for position, (name, search) in enumerate(sources):
+                if expires_at is None:
+                    urls = await search()
+                else:
+                    remaining = expires_at - loop.time()
+                    try:
+                        if remaining <= 0:
+                            raise asyncio.TimeoutError
+                        urls = await asyncio.wait_for(search(), remaining)
+                    except asyncio.TimeoutError:
+                        print(f"Search budget ran out at source {name}")
+                        if cut_off is not None:
+                            cut_off.extend(name for name, _ in sources[position:])
+                        return
+                collected.update(urls)
+                yield name, urls
+                if adaptive and len(collected) >= target:
+                    SearchService._record_early_stop([name for name, _ in sources[position + 1:]], target)
+                    return
+            return
 
-        # Site-specific searches for popular platforms
-        sites = [
-            "linkedin.com",
-            "reddit.com",
-            "twitter.com",
-            "github.com",
-            "stackoverflow.com",
-            "quora.com",
-        ]
-        for site in sites:
-            all_urls.extend(SearchService._search_duckduckgo_site(company_description, num_links, site=site))
+        deadline = settings.SEARCH_DEADLINE_SECONDS if deadline is None else min(deadline, settings.SEARCH_DEADLINE_SECONDS)
+        expires_at = loop.time() + deadline
+        queue = list(sources)
+        tasks: Dict[asyncio.Future, str] = {}
+
+        def launch(running: Set[asyncio.Future]) -> Set[asyncio.Future]:
+            # Start sources until the running ones are expected to cover the target
+            started = set()
+            while queue and (
+                not adaptive
+                or not (running or started)
+                or len(collected) + sum(SearchService._expected_unique(tasks[task]) for task in running | started)
+                < target * settings.SEARCH_FANOUT_MARGIN
+            ):
+                name, search = queue.pop(0)
+                task = asyncio.ensure_future(search())
+                tasks[task] = name
+                started.add(task)
+            return started
+
+        pending = launch(set())
+        cancel_reason = "timeout"
+        try:
+            while pending:
+                remaining = expires_at - loop.time()
+                if remaining <= 0:
+                    for task in pending:
+                        print(f"Search source {tasks[task]} exceeded {deadline:g}s deadline")
+                    if cut_off is not None:
+                        cut_off.extend([tasks[task] for task in pending] + [name for name, _ in queue])
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        urls = task.result()
+                    except Exception as e:
+                        print(f"Search source {tasks[task]} failed: {e}")
+                        continue
+                    collected.update(urls)
+                    yield tasks[task], urls
+                if adaptive and len(collected) >= target:
+                    cancel_reason = "cancelled"
+                    SearchService._record_early_stop([tasks[task] for task in pending] + [name for name, _ in queue], target)
+                    break
+                pending |= launch(pending)
+        finally:
+            for task in pending:
+                task.cancel(cancel_reason)
+
+    @staticmethod
+    async def merge_source_results(
+        company_description: str,
+        num_links: int,
+        results: Dict[str, List[str]],
+        deadline: Optional[float] = None,
+        cut_off: Optional[List[str]] = None,
+    ) -> List[str]:
+        """
+        Merge per-source results in fixed priority order, falling back to Quora
+        when empty. A fallback that outlasts `deadline` is cancelled and recorded
+        in `cut_off` as "quora-direct".
+        """
+        all_urls = []
+        for name in SOURCE_NAMES:
+            all_urls.extend(results.get(name, []))
+
+        SearchService._record_source_yields(results)
 
         # Fallback directly to Quora search if nothing found
         if not all_urls:
-            all_urls.extend(SearchService._search_quora_direct(company_description, num_links))
+            def fallback() -> Awaitable[List[str]]:
+                return SearchService._cached_search(
+                    "quora-direct", company_description, num_links,
+                    lambda: SearchService._timed_search(
+                        "quora-direct", lambda: SearchService._search_quora_direct(company_description, num_links)
+                    ),
+                )
+
+            try:
+                if deadline is None:
+                    all_urls.extend(await fallback())
+                elif deadline > 0:
+                    all_urls.extend(await asyncio.wait_for(fallback(), deadline))
+                else:
+                    raise asyncio.TimeoutError
+            except asyncio.TimeoutError:
+                print("Search budget ran out before the Quora fallback finished")
+                if cut_off is not None:
+                    cut_off.append("quora-direct")
+
+        await SearchService._flush_source_stats()
 
         # Dedupe and return more results (multiply requested to ensure variety)
-        deduped = SearchService._dedupe(all_urls)
+        deduped = SearchService.collapse_urls(all_urls)[0]
         # Return up to 3x requested to give more options from multiple sources
         return deduped[:max(num_links * 3, 10)]
 
     @staticmethod
-    def _search_firecrawl(company_description: str, num_links: int) -> List[str]:
+    def _build_sources(company_description: str, num_links: int) -> List[Tuple[str, Callable[[], Awaitable[List[str]]]]]:
+        """Search sources as (name, coroutine factory) pairs in merge priority order, each behind the result cache."""
+        searches = [
+            ("firecrawl", lambda: SearchService._search_firecrawl(company_description, num_links)),
+            ("generic", lambda: SearchService._search_duckduckgo_generic(company_description, num_links)),
+        ]
+        for site in SITE_SOURCES:
+            searches.append(
+                (site, lambda site=site: SearchService._search_duckduckgo_site(company_description, num_links, site=site))
+            )
+        return [
+            (name, lambda name=name, search=search: SearchService._cached_search(
+                name, company_description, num_links, lambda: SearchService._timed_search(name, search)
+            ))
+            for name, search in searches
+        ]
+
+    @staticmethod
+    async def _timed_search(source: str, search: Callable[[], Awaitable[List[str]]]) -> List[str]:
+        """Run a source's search inside a metrics span; cancellation at the deadline counts as a timeout."""
+        with Metrics.span("search_source", source=source) as span:
+            started = time.perf_counter()
+            urls = await search()
+            span.result(urls)
+            SearchService._record_source_latency(source, time.perf_counter() - started)
+            return urls
+
+    @staticmethod
+    def source_stats() -> Dict[str, Dict[str, Optional[float]]]:
+        """Rolling stats per search source, with the score used to order them (None until explored)."""
+        SearchService._load_source_stats()
+        with SearchService._stats_lock:
+            scores = {source: SearchService._source_score(source) for source in SearchService._source_stats}
+            return {
+                source: {**stats, "score": None if scores[source] == float("inf") else scores[source]}
+                for source, stats in SearchService._source_stats.items()
+            }
+
+    @staticmethod
+    def _plan_sources(sources: List[Tuple[str, Callable]]) -> List[Tuple[str, Callable]]:
+        """
+        Order sources by score (unexplored sources first, in priority order) and drop
+        those whose unique contribution stays below SEARCH_SKIP_MIN_UNIQUE, except for
+        an occasional SEARCH_EXPLORE_RATE probe that keeps their stats current.
+        """
+        if not settings.SEARCH_ADAPTIVE:
+            return sources
+        SearchService._load_source_stats()
+        planned, skipped = [], []
+        for name, search in sources:
+            stats = SearchService._source_stats.get(name)
+            if (
+                stats is not None
+                and stats["samples"] >= settings.SEARCH_STATS_MIN_SAMPLES
+                and stats["unique"] < settings.SEARCH_SKIP_MIN_UNIQUE
+                and random.random() >= settings.SEARCH_EXPLORE_RATE
+            ):
+                skipped.append(name)
+            else:
+                planned.append((name, search))
+        if not planned:
+            return sources
+        for name in skipped:
+            Metrics.inc("search_source_skipped", source=name, reason="low_yield")
+        return sorted(planned, key=lambda item: -SearchService._source_score(item[0]))
+
+    @staticmethod
+    def _source_score(source: str) -> float:
+        """Unique URLs per second of latency; unexplored sources score highest (inf, for sorting only)."""
+        stats = SearchService._source_stats.get(source)
+        if stats is None or stats["samples"] < settings.SEARCH_STATS_MIN_SAMPLES or not stats.get("latency_samples"):
+            return float("inf")
+        return stats["unique"] / max(stats["latency"], 0.05)
+
+    @staticmethod
+    def _expected_unique(source: str) -> float:
+        stats = SearchService._source_stats.get(source)
+        if stats is None or stats["samples"] < settings.SEARCH_STATS_MIN_SAMPLES:
+            return 0.0
+        return stats["unique"]
+
+    @staticmethod
+    def _record_early_stop(sources: List[str], target: int) -> None:
+        if sources:
+            print(f"Search reached {target} unique URLs; not waiting for {', '.join(sources)}")
+        for source in sources:
+            Metrics.inc("search_source_skipped", source=source, reason="early_stop")
+
+    @staticmethod
+    def _record_source_latency(source: str, seconds: float) -> None:
+        SearchService._load_source_stats()
+        with SearchService._stats_lock:
+            stats = SearchService._source_stats.setdefault(source, SearchService._empty_stats())
+            stats["latency"] = SearchService._ewma(stats["latency"], seconds, stats["latency_samples"])
+            stats["latency_samples"] += 1
+            SearchService._dirty_sources.add(source)
+
+    @staticmethod
+    def _record_source_yields(results: Dict[str, List[str]]) -> None:
+        """Update yield and unique contribution (URLs no other source returned this run) per source."""
+        if not results:
+            return
+        SearchService._load_source_stats()
+        with SearchService._stats_lock:
+            for source, urls in results.items():
+                others = {url for other, other_urls in results.items() if other != source for url in other_urls}
+                unique = len(set(urls) - others)
+                stats = SearchService._source_stats.setdefault(source, SearchService._empty_stats())
+                stats["yield"] = SearchService._ewma(stats["yield"], len(urls), stats["samples"])
+                stats["unique"] = SearchService._ewma(stats["unique"], unique, stats["samples"])
+                stats["samples"] += 1
+            SearchService._dirty_sources.update(results)
+
+    @staticmethod
+    def _ewma(current: float, value: float, samples: float) -> float:
+        if not samples:
+            return float(value)
+        return current + settings.SEARCH_STATS_ALPHA * (value - current)
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, float]:
+        return {"samples": 0, "latency_samples": 0, "latency": 0.0, "yield": 0.0, "unique": 0.0}
+
+    @staticmethod
+    def _load_source_stats() -> None:
+        if SearchService._stats_loaded:
+            return
+        SearchService._stats_loaded = True
+        if not settings.SEARCH_STATS_PATH:
+            return
+        SearchService._stats_store = SQLiteCache(settings.SEARCH_STATS_PATH, table="search_source_stats")
+        with SearchService._stats_lock:
+            for source in [*SOURCE_NAMES, "quora-direct"]:
+                entry = SearchService._stats_store.get(source)
+                if entry is not None:
+                    SearchService._source_stats[source] = {**SearchService._empty_stats(), **entry[0]}
+
+    @staticmethod
+    async def _flush_source_stats() -> None:
+        """Write the stats changed since the last flush in one transaction, off the event loop."""
+        with SearchService._stats_lock:
+            changed = {
+                source: dict(SearchService._source_stats[source])
+                for source in SearchService._dirty_sources
+                if source in SearchService._source_stats
+            }
+            SearchService._dirty_sources.clear()
+        if SearchService._stats_store is not None and changed:
+            await asyncio.to_thread(SearchService._stats_store.set_many, changed)
+
+    @staticmethod
+    async def _cached_search(
+        source: str, company_description: str, num_links: int, search: Callable[[], Awaitable[List[str]]]
+    ) -> List[str]:
+        """
+        Serve a source's results from the cache keyed by (normalized description, source, num_links).
+        Fresh entries are returned as-is; stale ones are returned immediately while a
+        background task refreshes them. Only non-empty results are cached so a
+        transient failure doesn't pin an empty answer. Concurrent misses for the same
+        key share one outbound search.
+        """
+        key = (SearchService._normalize_description(company_description), source, num_links)
+        entry = SearchService._result_cache.get_entry(key)
+        if entry is None:
+            SearchService._record_cache(source, "misses")
+            urls = await SearchService._search_flight.do(key, search)
+            if urls:
+                SearchService._result_cache.set(key, urls)
+            return urls
+
+        urls, stored_at = entry
+        if time.time() - stored_at <= settings.SEARCH_CACHE_TTL_SECONDS:
+            SearchService._record_cache(source, "hits")
+        else:
+            SearchService._record_cache(source, "stale")
+            if key not in SearchService._refreshing:
+                SearchService._refreshing.add(key)
+                # Bounded like a search; under run_sync it's awaited before the loop closes
+                HttpClient.background(SearchService._refresh(key, search), settings.SEARCH_DEADLINE_SECONDS)
+        return list(urls)
+
+    @staticmethod
+    async def _refresh(key: Tuple[str, str, int], search: Callable[[], Awaitable[List[str]]]) -> None:
         try:
-            url = "https://api.firecrawl.dev/v1/search"
+            urls = await SearchService._search_flight.do(key, search)
+            if urls:
+                SearchService._result_cache.set(key, urls)
+        except Exception as e:
+            print(f"Background refresh of {key[1]} search failed: {e}")
+        finally:
+            SearchService._refreshing.discard(key)
+
+    @staticmethod
+    def cache_stats() -> Dict[str, Dict[str, int]]:
+        """Hit / miss / stale counters per search source."""
+        return {source: dict(counts) for source, counts in SearchService._cache_stats.items()}
+
+    @staticmethod
+    def _record_cache(source: str, counter: str) -> None:
+        counts = SearchService._cache_stats.setdefault(source, {"hits": 0, "misses": 0, "stale": 0})
+        counts[counter] += 1
+
+    @staticmethod
+    def _normalize_description(company_description: str) -> str:
+        return " ".join(re.sub(r"[^\w\s]", " ", company_description.lower()).split())
+
+    @staticmethod
+    async def _search_firecrawl(company_description: str, num_links: int) -> List[str]:
+        try:
+            url = f"{settings.FIRECRAWL_API_URL}/v1/search"
             headers = {
                 "Authorization": f"Bearer {os.getenv('FIRECRAWL_API_KEY')}",
                 "Content-Type": "application/json"
@@ -60,26 +436,68 @@ class SearchService:
                 "location": "United States",
                 "timeout": 60000,
             }
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            # While Firecrawl is failing, skip straight to the other sources instead of waiting out its timeout
+            with CircuitBreaker.get("firecrawl-search").guard() as call:
+                response = await HttpClient.post(
+                    url, json=payload, headers=headers, read_timeout=settings.FIRECRAWL_READ_TIMEOUT
+                )
+                if response.status_code >= 500 or response.status_code == 429:
+                    call.fail()
             if response.status_code == 200:
                 urls = [result.get("url") for result in response.json().get("data", []) if result.get("url")]
                 return SearchService._dedupe(urls)[:num_links]
+            Metrics.fail()
         except Exception as e:
             print(f"Firecrawl search failed: {e}")
+            Metrics.fail(e)
         return []
 
     @staticmethod
-    def _search_duckduckgo_generic(company_description: str, num_links: int) -> List[str]:
+    async def _post_duckduckgo(url: str, params: dict, headers: dict) -> "httpx.Response":
+        """
+        POST a DuckDuckGo HTML search behind the "duckduckgo" circuit breaker; a
+        CAPTCHA/anomaly page raises BlockedPageError (outcome "throttled"). With
+        DUCKDUCKGO_HEDGE_ENABLED, a call still running past the breaker's
+        DUCKDUCKGO_HEDGE_PERCENTILE latency is raced against a duplicate.
+        """
+        breaker = CircuitBreaker.get("duckduckgo")
+        with breaker.guard() as call:
+            send = lambda: HttpClient.post(url, data=params, headers=headers)
+            delay = None
+            if settings.DUCKDUCKGO_HEDGE_ENABLED:
+                delay = breaker.latency_percentile(
+                    settings.DUCKDUCKGO_HEDGE_PERCENTILE, settings.DUCKDUCKGO_HEDGE_MIN_SAMPLES
+                )
+            resp = await (send() if delay is None else HttpClient.hedge(send, delay, "duckduckgo"))
+            if resp.status_code >= 500 or resp.status_code == 429:
+                call.fail()
+            if resp.status_code in THROTTLE_STATUSES:
+                # Count it against the host's rate instead of passing it off as "no results"
+                Metrics.fail(outcome="throttled")
+            elif SearchService._is_soft_blocked(resp):
+                # Raised rather than returned: a 200 anomaly page's links aren't search results
+                HostRateLimiter.throttle(HttpClient.rate_key(url), reason="captcha")
+                raise BlockedPageError(f"DuckDuckGo answered with a block page (HTTP {resp.status_code})")
+            return resp
+
+    @staticmethod
+    def _is_soft_blocked(resp: "httpx.Response") -> bool:
+        """DuckDuckGo answers bursts with a 202 or an anomaly (CAPTCHA) page instead of a 429."""
+        return resp.status_code == 202 or (resp.status_code == 200 and "anomaly-modal" in resp.text)
+
+    @staticmethod
+    async def _search_duckduckgo_generic(company_description: str, num_links: int) -> List[str]:
         """DuckDuckGo HTML search across the web (no site restriction)."""
         try:
             query = company_description.replace('"', '').replace("'", "").strip()
-            url = "https://duckduckgo.com/html/"
+            url = settings.DUCKDUCKGO_HTML_URL
             params = {"q": query}
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
             }
-            resp = requests.post(url, data=params, headers=headers, timeout=10)
+            resp = await SearchService._post_duckduckgo(url, params, headers)
             if resp.status_code != 200:
+                Metrics.fail()
                 return []
 
             import re
@@ -102,20 +520,22 @@ class SearchService:
             return cleaned[:num_links]
         except Exception as e:
             print(f"DuckDuckGo generic search failed: {e}")
+            Metrics.fail(e)
         return []
 
     @staticmethod
-    def _search_duckduckgo(company_description: str, num_links: int) -> List[str]:
+    async def _search_duckduckgo(company_description: str, num_links: int) -> List[str]:
         """Lightweight HTML search without extra dependencies."""
         try:
             query = company_description.replace('"', '').replace("'", "").strip()
-            url = "https://duckduckgo.com/html/"
+            url = settings.DUCKDUCKGO_HTML_URL
             params = {"q": f"site:quora.com {query}"}
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
             }
-            resp = requests.post(url, data=params, headers=headers, timeout=10)
+            resp = await SearchService._post_duckduckgo(url, params, headers)
             if resp.status_code != 200:
+                Metrics.fail()
                 return []
 
             import re
@@ -125,20 +545,22 @@ class SearchService:
             return cleaned[:num_links]
         except Exception as e:
             print(f"DuckDuckGo search failed: {e}")
+            Metrics.fail(e)
         return []
 
     @staticmethod
-    def _search_duckduckgo_site(company_description: str, num_links: int, site: str) -> List[str]:
+    async def _search_duckduckgo_site(company_description: str, num_links: int, site: str) -> List[str]:
         """DuckDuckGo HTML search restricted to a specific site (e.g., linkedin.com)."""
         try:
             query = company_description.replace('"', '').replace("'", "").strip()
-            url = "https://duckduckgo.com/html/"
+            url = settings.DUCKDUCKGO_HTML_URL
             params = {"q": f"site:{site} {query}"}
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
             }
-            resp = requests.post(url, data=params, headers=headers, timeout=10)
+            resp = await SearchService._post_duckduckgo(url, params, headers)
             if resp.status_code != 200:
+                Metrics.fail()
                 return []
 
             import re
@@ -162,26 +584,27 @@ class SearchService:
             return cleaned[:num_links]
         except Exception as e:
             print(f"DuckDuckGo {site} search failed: {e}")
+            Metrics.fail(e)
         return []
 
     @staticmethod
-    def _search_quora_direct(company_description: str, num_links: int) -> List[str]:
+    async def _search_quora_direct(company_description: str, num_links: int) -> List[str]:
         """Generate Quora search URLs directly as a final fallback."""
         try:
             clean_query = company_description.replace('"', '').replace("'", "").strip()
             search_terms = clean_query.split()[:4]
 
             base_urls = [
-                f"https://www.quora.com/search?q={'+'.join(search_terms)}",
+                f"{settings.QUORA_BASE_URL}/search?q={'+'.join(search_terms)}",
             ]
 
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
-            search_url = f"https://www.quora.com/search?q={'+'.join(search_terms)}"
+            search_url = f"{settings.QUORA_BASE_URL}/search?q={'+'.join(search_terms)}"
 
             try:
-                response = requests.get(search_url, headers=headers, timeout=10, allow_redirects=True)
+                response = await HttpClient.get(search_url, headers=headers)
                 if response.status_code == 200:
                     import re
                     question_pattern = r'href=\"(/[^\"?]+\??[^\"]*)\"'
@@ -190,7 +613,7 @@ class SearchService:
                     quora_urls = []
                     for match in matches:
                         if not any(x in match for x in ['profile', 'topic', 'search', 'about', 'contact']):
-                            full_url = f"https://www.quora.com{match}" if match.startswith('/') else match
+                            full_url = f"{settings.QUORA_BASE_URL}{match}" if match.startswith('/') else match
                             if full_url not in quora_urls and 'quora.com' in full_url:
                                 quora_urls.append(full_url)
 
@@ -202,17 +625,21 @@ class SearchService:
             return base_urls[:num_links]
         except Exception as e:
             print(f"Quora direct search failed: {e}")
+            Metrics.fail(e)
         return []
 
+    @staticmethod
+    def collapse_urls(urls: List[str], stage: str = "search") -> Tuple[List[str], int]:
+        """
+        Canonicalize URLs and drop equivalent variants (http/https, www/mobile hosts,
+        twitter.com/x.com, tracking parameters, ...). Returns (unique URLs, fetches avoided).
+        """
+        unique, collapsed = UrlCanonicalizer.collapse(urls)
+        if collapsed:
+            Metrics.inc("urls_collapsed", collapsed, stage=stage)
+        return unique, collapsed
+
     @staticmethod
     def _dedupe(urls: List[str]) -> List[str]:
-        seen = set()
-        unique = []
-        for u in urls:
-            if not u:
-                continue
-            if u in seen:
-                continue
-            seen.add(u)
-            unique.append(u)
-        return unique
\ No newline at end of file
+        """Per-source dedupe; not counted in urls_collapsed, since the merge dedupes again before extraction."""
+        return UrlCanonicalizer.collapse(urls)[0]
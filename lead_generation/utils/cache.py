@@ -0,0 +1,140 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class TTLCache:
+    """Thread-safe in-process LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        return default if entry is None else entry[0]
+
+    def get_entry(self, key: Any) -> Optional[Tuple[Any, float]]:
+        """Like get(), but return (value, stored_at) so callers can apply their own staleness rules."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[1] > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: Any, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache:
+    """
+    Small JSON key/value store on SQLite for caches that should survive restarts.
+
+    Entries are evicted least-recently-used first once `max_entries` is exceeded.
+    Reads don't write: access times are kept in memory and saved with the next
+    write, or once ACCESS_FLUSH_BATCH of them have piled up. If the database
+    can't be opened (e.g. a read-only serverless filesystem) the store disables
+    itself and every lookup misses.
+
+    Every call is blocking; async callers should run them via asyncio.to_thread.
+    """
+
+    ACCESS_FLUSH_BATCH = 256
+
+    def __init__(self, path: str, table: str = "cache", max_entries: Optional[int] = None):
+        self.table = table
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._accessed: Dict[str, float] = {}
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        except Exception as e:
+            print(f"Disk cache {path} unavailable: {e}")
+            self._conn = None
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, stored_at) or None."""
+        if self._conn is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= self.ACCESS_FLUSH_BATCH:
+                self._write_access_times()
+                self._conn.commit()
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None) -> None:
+        self.set_many({key: value}, stored_at)
+
+    def set_many(self, items: Dict[str, Any], stored_at: Optional[float] = None) -> None:
+        """Store several entries in one transaction."""
+        if self._conn is None or not items:
+            return
+        now = time.time()
+        with self._lock:
+            # Before the eviction below, so it sees which entries were read recently
+            self._write_access_times()
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                [(key, json.dumps(value), now if stored_at is None else stored_at, now) for key, value in items.items()],
+            )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ("
+                    f"SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        if self._conn is None:
+            return
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _write_access_times(self) -> None:
+        """Save pending access times in the caller's transaction (hold the lock)."""
+        if self._accessed:
+            self._conn.executemany(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()],
+            )
+            self._accessed.clear()
@@ -0,0 +1,174 @@
+import time
+import asyncio
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional
+from config.settings import settings
+from .metrics import Metrics
+from .rate_limiter import RateLimitedError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+    outcome = "circuit_open"
+
+
+class _Call:
+    def __init__(self):
+        self.failed = False
+
+    def fail(self) -> None:
+        """Count this call as a failure even though it didn't raise (e.g. a 5xx response)."""
+        self.failed = True
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker shared by every event loop and worker thread.
+
+    The last CIRCUIT_WINDOW calls are kept; once at least CIRCUIT_MIN_CALLS of
+    them are in and CIRCUIT_FAILURE_RATIO of them failed or were slower than the
+    endpoint's CIRCUIT_SLOW_CALL_SECONDS, the circuit opens and callers go
+    straight to their fallback. After CIRCUIT_OPEN_SECONDS it lets
+    CIRCUIT_HALF_OPEN_PROBES calls through: a success closes it, a failure
+    opens it again.
+    """
+
+    _breakers: Dict[str, "CircuitBreaker"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self._calls: Deque[bool] = deque(maxlen=max(1, settings.CIRCUIT_WINDOW))
+        self._latencies: Deque[float] = deque(maxlen=100)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get(name: str) -> "CircuitBreaker":
+        with CircuitBreaker._registry_lock:
+            breaker = CircuitBreaker._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker._breakers[name] = CircuitBreaker(name)
+            return breaker
+
+    @staticmethod
+    def stats() -> Dict[str, Dict[str, Any]]:
+        with CircuitBreaker._registry_lock:
+            breakers = list(CircuitBreaker._breakers.values())
+        return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+    @property
+    def slow_call_seconds(self) -> float:
+        return settings.CIRCUIT_SLOW_CALL_SECONDS.get(self.name, settings.HTTP_READ_TIMEOUT)
+
+    def is_open(self) -> bool:
+        """True while calls are being rejected outright (no probe is due yet)."""
+        with self._lock:
+            return self.state == OPEN and time.monotonic() - self._opened_at < settings.CIRCUIT_OPEN_SECONDS
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; in half-open state this claims a probe slot."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if now - self._opened_at < settings.CIRCUIT_OPEN_SECONDS:
+                    return False
+                self._transition(HALF_OPEN)
+                self._opened_at = now
+                self._probes = 0
+            elif now - self._opened_at >= settings.CIRCUIT_OPEN_SECONDS:
+                # Probes that never reported back (e.g. cancelled) don't block recovery forever
+                self._opened_at = now
+                self._probes = 0
+            if self._probes >= max(1, settings.CIRCUIT_HALF_OPEN_PROBES):
+                return False
+            self._probes += 1
+            return True
+
+    def record(self, ok: bool, seconds: float) -> None:
+        ok = ok and seconds <= self.slow_call_seconds
+        with self._lock:
+            if ok:
+                self._latencies.append(seconds)
+            if self.state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if ok:
+                    self._calls.clear()
+                    self._transition(CLOSED)
+                else:
+                    self._opened_at = time.monotonic()
+                    self._transition(OPEN)
+                return
+            self._calls.append(ok)
+            failures = self._calls.count(False)
+            if (
+                self.state == CLOSED
+                and len(self._calls) >= settings.CIRCUIT_MIN_CALLS
+                and failures / len(self._calls) >= settings.CIRCUIT_FAILURE_RATIO
+            ):
+                self._opened_at = time.monotonic()
+                self._transition(OPEN)
+
+    def release(self) -> None:
+        """Give back a half-open probe slot without recording an outcome (the call was cancelled)."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+
+    @contextmanager
+    def guard(self) -> Iterator[_Call]:
+        """
+        Wrap one call to the endpoint: raises CircuitOpenError when the circuit
+        rejects it, otherwise times the body and records success or failure.
+        Cancellation is not held against the endpoint, and neither is
+        RateLimitedError: the call never left our own rate limiter.
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        call = _Call()
+        started = time.perf_counter()
+        try:
+            yield call
+        except (asyncio.CancelledError, RateLimitedError):
+            self.release()
+            raise
+        except Exception:
+            self.record(False, time.perf_counter() - started)
+            raise
+        self.record(not call.failed, time.perf_counter() - started)
+
+    def latency_percentile(self, pct: float, min_samples: int = 1) -> Optional[float]:
+        """Percentile of recent successful call latencies, or None with fewer than min_samples."""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < max(1, min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = list(self._calls)
+        return {
+            "state": self.state,
+            "window_calls": len(calls),
+            "window_failures": calls.count(False),
+            "slow_call_seconds": self.slow_call_seconds,
+            "p95_seconds": self.latency_percentile(95),
+        }
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            print(f"Circuit {self.name}: {self.state} -> {state}")
+            self.state = state
+            Metrics.inc("circuit_transitions", endpoint=self.name, state=state)
@@ -1,29 +1,86 @@
-from typing import List
+import heapq
+from typing import List, Optional
+from config.settings import settings
+from .relevance_ranker import RelevanceRanker
+
+# Column layout of a lead row, shared by the JSON response and the file exports
+LEAD_COLUMNS = [
+    "Website URL",
+    "Username",
+    "Bio",
+    "Post Type",
+    "Timestamp",
+    "Upvotes",
+    "Links",
+    "Source",
+    "Snippet",
+    "Confidence",
+    "Confidence Score",
+    "Relevance Score",
+    "Title",
+]
 
 class DataFormatter:
     @staticmethod
-    def format_user_info_to_json(user_info_list: List[dict]) -> List[dict]:
+    def format_user_info_to_json(
+        user_info_list: List[dict], query: str = "", company_description: str = "", top_k: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Flatten extraction results into lead rows, best first. Given the query or
+        company description, rows are also scored for relevance (RelevanceRanker)
+        and ordered by RERANK_WEIGHT * relevance + (1 - RERANK_WEIGHT) * confidence.
+        With top_k only the k best rows are returned (heap selection, no full sort).
+        """
         flattened_data = []
-        
+
         for info in user_info_list:
             website_url = info["website_url"]
             for interaction in info["user_info"]:
-                flattened_data.append({
-                    "Website URL": website_url,
-                    "Username": interaction.get("username", ""),
-                    "Bio": interaction.get("bio", ""),
-                    "Post Type": interaction.get("post_type", ""),
-                    "Timestamp": interaction.get("timestamp", ""),
-                    "Upvotes": interaction.get("upvotes", 0),
-                    "Links": ", ".join(interaction.get("links", [])),
-                    "Source": interaction.get("source", ""),
-                    "Snippet": interaction.get("bio", ""),
-                    "Confidence": interaction.get("confidence", "unknown"),
-                    "Confidence Score": interaction.get("confidence_score", 0),
-                    "Title": interaction.get("title", ""),
-                })
-        
-        # Sort by confidence score (highest first)
-        flattened_data.sort(key=lambda x: x.get("Confidence Score", 0), reverse=True)
-        
-        return flattened_data
\ No newline at end of file
+                flattened_data.append(DataFormatter.format_interaction(website_url, interaction))
+
+        weight = 0.0
+        if settings.RERANK_ENABLED and (query or company_description):
+            weight = settings.RERANK_WEIGHT
+            for row, score in zip(flattened_data, RelevanceRanker.score(flattened_data, [query, company_description])):
+                row["Relevance Score"] = score
+
+        def rank(row: dict) -> float:
+            return weight * row.get("Relevance Score", 0) + (1 - weight) * row.get("Confidence Score", 0)
+
+        if top_k is not None and top_k < len(flattened_data):
+            return heapq.nlargest(max(0, top_k), flattened_data, key=rank)
+
+        # Sort by combined score (highest first)
+        flattened_data.sort(key=rank, reverse=True)
+
+        return flattened_data
+
+    @staticmethod
+    def format_unranked(info: dict) -> List[dict]:
+        """
+        Lead rows of one extraction result, as streamed before the final ranking.
+        Their Relevance Score is None: it depends on every lead of the request,
+        so only format_user_info_to_json sets it.
+        """
+        rows = [DataFormatter.format_interaction(info["website_url"], interaction) for interaction in info["user_info"]]
+        for row in rows:
+            row["Relevance Score"] = None
+        return rows
+
+    @staticmethod
+    def format_interaction(website_url: str, interaction: dict) -> dict:
+        return {
+            "Website URL": website_url,
+            "Username": interaction.get("username", ""),
+            "Bio": interaction.get("bio", ""),
+            "Post Type": interaction.get("post_type", ""),
+            "Timestamp": interaction.get("timestamp", ""),
+            "Upvotes": interaction.get("upvotes", 0),
+            "Links": ", ".join(interaction.get("links", [])),
+            "Source": interaction.get("source", ""),
+            "Snippet": interaction.get("bio", ""),
+            "Confidence": interaction.get("confidence", "unknown"),
+            "Confidence Score": interaction.get("confidence_score", 0),
+            "Relevance Score": 0,
+            "Title": interaction.get("title", ""),
+        }
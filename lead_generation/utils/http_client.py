@@ -0,0 +1,223 @@
+import asyncio
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Coroutine, Dict, Optional, Set
+from urllib.parse import urlparse
+from config.settings import settings
+from .metrics import Metrics
+from .rate_limiter import HostRateLimiter
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class HttpClient:
+    """
+    Shared outbound HTTP layer for SearchService and ExtractionService.
+
+    One pooled httpx.AsyncClient is kept per event loop so connections to the
+    same host (duckduckgo.com in particular) are reused with keep-alive, and
+    HTTP/2 is negotiated when the optional `h2` package is installed.
+    Timeouts and pool sizes come from config.settings. Every request goes
+    through HostRateLimiter, which adapts each host's rate to its responses.
+    """
+
+    _clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+    # Fire-and-forget work per loop (e.g. stale-while-revalidate refreshes), drained by run_sync
+    _background: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Set[asyncio.Task]]" = weakref.WeakKeyDictionary()
+    _host_stats: Dict[str, Dict[str, int]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_client() -> "httpx.AsyncClient":
+        """Return the pooled client bound to the running event loop, creating it on first use."""
+        # httpx (and the rich it pulls in) loads on the first outbound request, not at app import
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        client = HttpClient._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=settings.HTTP2_ENABLED and HttpClient._http2_available(),
+                timeout=HttpClient.timeout(),
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+                ),
+                follow_redirects=True,
+            )
+            HttpClient._clients[loop] = client
+        return client
+
+    @staticmethod
+    def timeout(read_timeout: Optional[float] = None) -> "httpx.Timeout":
+        import httpx
+
+        read = settings.HTTP_READ_TIMEOUT if read_timeout is None else read_timeout
+        return httpx.Timeout(read, connect=settings.HTTP_CONNECT_TIMEOUT)
+
+    @staticmethod
+    async def request(method: str, url: str, read_timeout: Optional[float] = None, **kwargs: Any) -> "httpx.Response":
+        """Send a request through the pooled client, recording per-host statistics."""
+        host = urlparse(url).hostname or "unknown"
+        if read_timeout is not None:
+            kwargs["timeout"] = HttpClient.timeout(read_timeout)
+        try:
+            async with HostRateLimiter.slot(HttpClient.rate_key(url)):
+                response = await HttpClient.get_client().request(method, url, **kwargs)
+        except Exception:
+            HttpClient._record(host, "errors")
+            raise
+        HttpClient._record(host, "requests")
+        HostRateLimiter.record(HttpClient.rate_key(url), response.status_code, response.headers.get("Retry-After"))
+        return response
+
+    @staticmethod
+    @asynccontextmanager
+    async def stream(method: str, url: str, read_timeout: Optional[float] = None, **kwargs: Any) -> AsyncIterator["httpx.Response"]:
+        """Like request(), but yields the response before its body is read so callers can stop early."""
+        import httpx
+
+        host = urlparse(url).hostname or "unknown"
+        if read_timeout is not None:
+            kwargs["timeout"] = HttpClient.timeout(read_timeout)
+        try:
+            async with HostRateLimiter.slot(HttpClient.rate_key(url)):
+                async with HttpClient.get_client().stream(method, url, **kwargs) as response:
+                    HttpClient._record(host, "requests")
+                    HostRateLimiter.record(
+                        HttpClient.rate_key(url), response.status_code, response.headers.get("Retry-After")
+                    )
+                    yield response
+        except httpx.HTTPError:
+            HttpClient._record(host, "errors")
+            raise
+
+    @staticmethod
+    def rate_key(url: str) -> str:
+        """Rate limits are kept per host (and port, when one is given)."""
+        parts = urlparse(url)
+        host = parts.hostname or "unknown"
+        return f"{host}:{parts.port}" if parts.port else host
+
+    @staticmethod
+    async def get(url: str, **kwargs: Any) -> "httpx.Response":
+        return await HttpClient.request("GET", url, **kwargs)
+
+    @staticmethod
+    async def post(url: str, **kwargs: Any) -> "httpx.Response":
+        return await HttpClient.request("POST", url, **kwargs)
+
+    @staticmethod
+    async def hedge(send: Callable[[], Awaitable[Any]], delay: float, endpoint: str) -> Any:
+        """
+        Start send(); if it hasn't finished after `delay` seconds, start a duplicate
+        and return whichever copy succeeds first, cancelling the other.
+        """
+        primary = asyncio.ensure_future(send())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+            tasks.add(asyncio.ensure_future(send()))
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        Metrics.inc("hedged_requests", endpoint=endpoint, winner="primary" if task is primary else "hedge")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    async def aclose() -> None:
+        """Close the client bound to the running event loop, if any."""
+        client = HttpClient._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    @staticmethod
+    def background(coro: Coroutine, timeout: float) -> "asyncio.Task":
+        """
+        Run `coro` without awaiting it, giving up after `timeout` seconds. On a
+        long-lived loop (the API server's) it simply runs on; run_sync waits for
+        it before closing its loop, so the work isn't cancelled half-way.
+        """
+        async def bounded():
+            try:
+                await asyncio.wait_for(coro, timeout)
+            except asyncio.TimeoutError:
+                print(f"Background task gave up after {timeout:.1f}s")
+
+        task = asyncio.ensure_future(bounded())
+        tasks = HttpClient._background.setdefault(asyncio.get_running_loop(), set())
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        return task
+
+    @staticmethod
+    def run_sync(coro: Coroutine) -> Any:
+        """
+        Run a coroutine on a fresh event loop, wait for the background work it
+        started and release that loop's pooled client afterwards.
+        """
+        async def runner():
+            try:
+                return await coro
+            finally:
+                tasks = HttpClient._background.pop(asyncio.get_running_loop(), None)
+                if tasks:
+                    await asyncio.wait(tasks)
+                await HttpClient.aclose()
+
+        return asyncio.run(runner())
+
+    @staticmethod
+    def pool_stats() -> Dict[str, Any]:
+        """Per-host request counters plus open/idle connections across all live pools."""
+        with HttpClient._lock:
+            hosts = {host: {**counts, "open_connections": 0, "idle_connections": 0}
+                     for host, counts in HttpClient._host_stats.items()}
+
+        pools = 0
+        for client in list(HttpClient._clients.values()):
+            if client.is_closed:
+                continue
+            pools += 1
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            for connection in getattr(pool, "connections", []):
+                origin = getattr(connection, "_origin", None)
+                host = origin.host.decode() if origin is not None else "unknown"
+                entry = hosts.setdefault(host, {"requests": 0, "errors": 0, "open_connections": 0, "idle_connections": 0})
+                entry["open_connections"] += 1
+                if connection.is_idle():
+                    entry["idle_connections"] += 1
+
+        return {
+            "pools": pools,
+            "http2": settings.HTTP2_ENABLED and HttpClient._http2_available(),
+            "max_connections": settings.HTTP_MAX_CONNECTIONS,
+            "max_keepalive_connections": settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            "hosts": hosts,
+        }
+
+    @staticmethod
+    def _record(host: str, counter: str) -> None:
+        with HttpClient._lock:
+            entry = HttpClient._host_stats.setdefault(host, {"requests": 0, "errors": 0})
+            entry[counter] += 1
+
+    @staticmethod
+    def _http2_available() -> bool:
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            return False
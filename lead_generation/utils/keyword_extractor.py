@@ -0,0 +1,85 @@
+import re
+from typing import List, Tuple
+from .relevance_ranker import STOPWORDS
+
+# "Find leads for", "Generate leads for", "Find people interested in", "companies who need", ...
+LEAD_REQUEST_PATTERN = re.compile(
+    r"^\s*(?:please\s+)?"
+    r"(?:(?:find|generate|get|search\s+for|look\s+for|looking\s+for|show\s+me|list|i\s+need|we\s+need|i\s+want|we\s+want)\s+)?"
+    r"(?:(?:some|more|potential|qualified|new|good)\s+)*"
+    r"(?:leads?|people|persons|users|customers|companies|businesses|prospects|clients|buyers|founders|teams)\s+"
+    r"(?:(?:who|that)\s+(?:are\s+|is\s+)?"
+    r"(?:need|needs|want|wants|use|uses|using|buy|buying|looking\s+for|interested\s+in|searching\s+for)\s+"
+    r"|interested\s+in\s+|looking\s+for\s+|in\s+need\s+of\s+|for\s+|of\s+|using\s+|with\s+)?",
+    re.IGNORECASE,
+)
+# Where the core product phrase usually ends: "voice cloning | for audiobooks"
+BOUNDARY_PATTERN = re.compile(
+    r"\s+(?:for|in|to|on|at|from|among|across|within|who|that|which|because|so|since|near)\s+|\s*[,;:.!?()]\s*",
+    re.IGNORECASE,
+)
+WORD_PATTERN = re.compile(r"[A-Za-z0-9][\w+#&'-]*")
+# Hyphen suffixes that add nothing to a description ("AI-powered" -> "AI")
+FILLER_SUFFIXES = {"powered", "based", "driven", "enabled", "focused", "related", "oriented"}
+FILLER_WORDS = STOPWORDS | {
+    "leads", "lead", "prospects", "potential", "generate", "get", "search", "list", "some", "any", "my", "our",
+    "their", "me", "us", "you", "your", "help", "would", "could", "should", "can", "will", "like", "really",
+    "very", "please", "new", "best", "good", "interested", "about", "into", "using", "use", "uses", "buy",
+    "he", "she", "they", "them", "these", "those", "there", "here", "all", "also", "just", "more", "most",
+    "i'm", "im", "we're", "i've", "we've",
+}
+# Words whose meaning a keyword list would lose
+NEGATIONS = {"not", "no", "without", "except", "excluding", "never", "non", "avoid", "instead"}
+MAX_WORDS = 4
+
+
+class KeywordExtractor:
+    """
+    Deterministic stand-in for the LLM query transform. The lead-request
+    preamble ("Find leads for", "people interested in") is stripped, the rest is
+    cut at the first qualifier ("for e-commerce stores", "who ...") once two
+    keywords are collected, and stop words are dropped. The confidence (0-1)
+    says how much of the query the description kept and how typical its shape
+    was; callers escape to the LLM below their threshold.
+    """
+
+    @staticmethod
+    def describe(user_query: str) -> Tuple[str, float]:
+        """(3-4 word description, confidence)."""
+        match = LEAD_REQUEST_PATTERN.match(user_query)
+        remainder = user_query[match.end():] if match and match.end() else user_query
+        content = KeywordExtractor._keywords(remainder)
+
+        keywords: List[str] = []
+        for segment in BOUNDARY_PATTERN.split(remainder):
+            if len(keywords) >= 2:
+                break
+            keywords += KeywordExtractor._keywords(segment)
+        keywords = keywords[:MAX_WORDS]
+        if not keywords:
+            return "", 0.0
+
+        confidence = 0.5 if match and match.end() else 0.3
+        if 2 <= len(keywords) <= MAX_WORDS:
+            confidence += 0.4
+        if len(keywords) == len(content):
+            # The description is everything the user said
+            confidence += 0.2
+        elif len(keywords) < 0.6 * len(content):
+            # Much of what the user said didn't make it into the description
+            confidence -= 0.3
+        if any(word.lower() in NEGATIONS for word in WORD_PATTERN.findall(user_query)):
+            confidence -= 0.4
+        return " ".join(keywords), round(max(0.0, min(1.0, confidence)), 2)
+
+    @staticmethod
+    def _keywords(text: str) -> List[str]:
+        keywords = []
+        for word in WORD_PATTERN.findall(text):
+            head, _, suffix = word.rpartition("-")
+            if head and suffix.lower() in FILLER_SUFFIXES:
+                word = head
+            word = word.strip("-'")
+            if (len(word) > 1 or word.isdigit()) and word.lower() not in FILLER_WORDS and word.lower() not in NEGATIONS:
+                keywords.append(word)
+        return keywords
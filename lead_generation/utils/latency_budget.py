@@ -0,0 +1,59 @@
+import time
+import asyncio
+from typing import AsyncIterator, Optional, TypeVar
+from config.settings import settings
+
+T = TypeVar("T")
+
+
+class LatencyBudget:
+    """
+    A per-request time budget split across the pipeline stages.
+
+    Each stage gets its BUDGET_STAGE_SHARES fraction of whatever is left when it
+    starts, relative to the stages still to run, so time a fast stage doesn't use
+    rolls over to the later ones. The last stage gets everything that remains.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.started = time.monotonic()
+
+    def remaining(self) -> float:
+        return max(0.0, self.seconds - (time.monotonic() - self.started))
+
+    def allot(self, stage: str) -> float:
+        """Seconds `stage` may use, starting now."""
+        stages = list(settings.BUDGET_STAGE_SHARES)
+        later = stages[stages.index(stage):]
+        total_share = sum(settings.BUDGET_STAGE_SHARES[name] for name in later)
+        if len(later) == 1 or total_share <= 0:
+            return self.remaining()
+        return self.remaining() * settings.BUDGET_STAGE_SHARES[stage] / total_share
+
+    @staticmethod
+    async def iter_within(iterator: AsyncIterator[T], seconds: Optional[float]) -> AsyncIterator[T]:
+        """
+        Re-yield items from an async iterator until `seconds` run out, then cancel
+        the step in progress (the iterator's own cleanup cancels its pending work).
+        The deadline only applies while waiting for the next item, never while the
+        consumer handles one.
+        """
+        if seconds is None:
+            async for item in iterator:
+                yield item
+            return
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + seconds
+        try:
+            while True:
+                remaining = expires_at - loop.time()
+                if remaining <= 0:
+                    return
+                try:
+                    item = await asyncio.wait_for(iterator.__anext__(), remaining)
+                except (StopAsyncIteration, asyncio.TimeoutError):
+                    return
+                yield item
+        finally:
+            await iterator.aclose()
@@ -0,0 +1,156 @@
+import io
+import csv
+import json
+import zlib
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, List, Optional
+from config.settings import settings
+from .data_formatter import LEAD_COLUMNS
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+INTEGER_COLUMNS = {"Upvotes", "Confidence Score", "Relevance Score"}
+
+
+class _ParquetSink:
+    """Write-only file object whose bytes are drained after every row group."""
+
+    def __init__(self):
+        self._buffer = io.BytesIO()
+        self.closed = False
+
+    def write(self, data) -> int:
+        return self._buffer.write(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def tell(self) -> int:
+        return self._buffer.tell()
+
+    def drain(self) -> bytes:
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+class LeadExporter:
+    """
+    Stream lead rows (the DataFormatter column layout) as CSV, NDJSON or Parquet,
+    optionally gzipped. Rows are encoded EXPORT_CHUNK_ROWS at a time (one
+    Parquet row group per chunk) so the whole file is never held in memory.
+    Parquet needs the optional `pyarrow` package.
+    """
+
+    @staticmethod
+    async def export(
+        rows: AsyncIterable[dict], fmt: str, compress: bool = False, columns: Optional[List[str]] = None
+    ) -> AsyncIterator[bytes]:
+        columns = columns or LEAD_COLUMNS
+        encoders = {"csv": LeadExporter._csv, "ndjson": LeadExporter._ndjson, "parquet": LeadExporter._parquet}
+        chunks = encoders[fmt](LeadExporter._chunked(rows), columns)
+        if compress:
+            chunks = LeadExporter._gzip(chunks)
+        async for chunk in chunks:
+            if chunk:
+                yield chunk
+
+    @staticmethod
+    def media_type(fmt: str, compress: bool = False) -> str:
+        return "application/gzip" if compress else EXPORT_FORMATS[fmt][0]
+
+    @staticmethod
+    def filename(stem: str, fmt: str, compress: bool = False) -> str:
+        return f"{stem}.{EXPORT_FORMATS[fmt][1]}" + (".gz" if compress else "")
+
+    @staticmethod
+    def parquet_available() -> bool:
+        try:
+            import pyarrow  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    @staticmethod
+    async def iter_rows(rows: Iterable[dict]) -> AsyncIterator[dict]:
+        """Adapt already-materialized rows (a finished job, a batch result) to export()."""
+        for row in rows:
+            yield row
+
+    @staticmethod
+    async def _chunked(rows: AsyncIterable[dict]) -> AsyncIterator[List[dict]]:
+        size = max(1, settings.EXPORT_CHUNK_ROWS)
+        chunk = []
+        async for row in rows:
+            chunk.append(row)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    async def _csv(chunks: AsyncIterator[List[dict]], columns: List[str]) -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        async for chunk in chunks:
+            writer.writerows(chunk)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    async def _ndjson(chunks: AsyncIterator[List[dict]], columns: List[str]) -> AsyncIterator[bytes]:
+        async for chunk in chunks:
+            lines = (json.dumps({column: row.get(column, "") for column in columns}) for row in chunk)
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+    @staticmethod
+    async def _parquet(chunks: AsyncIterator[List[dict]], columns: List[str]) -> AsyncIterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([
+            (column, pa.int64() if column in INTEGER_COLUMNS else pa.string()) for column in columns
+        ])
+        sink = _ParquetSink()
+        writer = pq.ParquetWriter(sink, schema, compression="snappy")
+        try:
+            async for chunk in chunks:
+                table = pa.Table.from_pydict(
+                    {column: [LeadExporter._parquet_value(column, row.get(column)) for row in chunk] for column in columns},
+                    schema=schema,
+                )
+                writer.write_table(table)
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    @staticmethod
+    def _parquet_value(column: str, value: Any) -> Any:
+        if column in INTEGER_COLUMNS:
+            if value is None:
+                # e.g. the Relevance Score of a lead streamed before ranking
+                return None
+            try:
+                return int(value or 0)
+            except (TypeError, ValueError):
+                return 0
+        return "" if value is None else str(value)
+
+    @staticmethod
+    async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        compressor = zlib.compressobj(settings.EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31)
+        async for chunk in chunks:
+            yield compressor.compress(chunk)
+        yield compressor.flush()
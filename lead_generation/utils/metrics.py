@@ -0,0 +1,235 @@
+import time
+import asyncio
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# short name -> (Prometheus name, help, label names)
+HISTOGRAMS = {
+    "stage": (
+        "leadfinder_stage_duration_seconds",
+        "Latency of each pipeline stage (transform, search, extract, total).",
+        ("stage", "outcome"),
+    ),
+    "transform": (
+        "leadfinder_transform_duration_seconds",
+        "Latency of query transforms, including cache hits.",
+        ("outcome",),
+    ),
+    "search_source": (
+        "leadfinder_search_source_duration_seconds",
+        "Latency of each search source call that missed the result cache.",
+        ("source", "outcome"),
+    ),
+    "extraction": (
+        "leadfinder_extraction_duration_seconds",
+        "Latency of each per-URL extraction method.",
+        ("method", "outcome"),
+    ),
+}
+COUNTERS = {
+    "placeholder_fallback": (
+        "leadfinder_placeholder_fallbacks_total",
+        "Leads replaced by placeholder entries because extraction produced nothing.",
+        ("stage",),
+    ),
+    "local_transforms": (
+        "leadfinder_local_transforms_total",
+        "Queries the local keyword transformer answered (answered) or escaped to the LLM (low_confidence, requested).",
+        ("result",),
+    ),
+    "search_source_skipped": (
+        "leadfinder_search_source_skipped_total",
+        "Search source calls avoided by the adaptive scheduler (low_yield or early_stop).",
+        ("source", "reason"),
+    ),
+    "circuit_transitions": (
+        "leadfinder_circuit_transitions_total",
+        "Circuit breaker state changes per endpoint.",
+        ("endpoint", "state"),
+    ),
+    "urls_collapsed": (
+        "leadfinder_urls_collapsed_total",
+        "Fetches avoided by collapsing equivalent URL variants before extraction.",
+        ("stage",),
+    ),
+    "hedged_requests": (
+        "leadfinder_hedged_requests_total",
+        "Hedged duplicate requests sent, by which copy answered first.",
+        ("endpoint", "winner"),
+    ),
+    "throttled_responses": (
+        "leadfinder_throttled_responses_total",
+        "429/503 responses and detected soft blocks that made a host back off.",
+        ("host", "reason"),
+    ),
+    "rate_limited_requests": (
+        "leadfinder_rate_limited_requests_total",
+        "Requests refused locally because a host's rate limit would have held them too long.",
+        ("host",),
+    ),
+    "budget_cut_offs": (
+        "leadfinder_budget_cut_offs_total",
+        "Work dropped because a request's latency budget ran out (transforms, search sources, URLs).",
+        ("stage",),
+    ),
+    "coalesced_calls": (
+        "leadfinder_coalesced_calls_total",
+        "Calls that waited on an identical in-flight call instead of running their own.",
+        ("level",),
+    ),
+}
+
+# Span currently running in this task (or thread), and the optional per-request trace
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("leadfinder_span", default=None)
+_trace: contextvars.ContextVar[Optional[List[dict]]] = contextvars.ContextVar("leadfinder_trace", default=None)
+
+
+class Span:
+    """A timed unit of work. Outcome is success unless marked or the body raises."""
+
+    def __init__(self, metric: str, labels: Dict[str, str], detail: Optional[str] = None):
+        self.metric = metric
+        self.labels = labels
+        self.detail = detail
+        self.outcome: Optional[str] = None
+
+    def result(self, items: Any) -> None:
+        """Mark the span empty when it produced nothing (unless already failed)."""
+        if not items and self.outcome is None:
+            self.outcome = "empty"
+
+
+class Metrics:
+    """
+    In-process Prometheus-style histograms and counters for the pipeline.
+
+    Services wrap each unit of work in `Metrics.span(...)`; code that swallows
+    an error calls `Metrics.fail(e)` so the enclosing span is counted as a
+    failure or timeout rather than an empty result. Inside `Metrics.collect()`
+    every finished span is also appended to a per-request trace.
+    """
+
+    _lock = threading.Lock()
+    # (short name, label values) -> [bucket counts..., sum, count]
+    _histograms: Dict[Tuple[str, Tuple[str, ...]], List[float]] = {}
+    _counters: Dict[Tuple[str, Tuple[str, ...]], float] = {}
+
+    @staticmethod
+    @contextmanager
+    def span(metric: str, detail: Optional[str] = None, **labels: str) -> Iterator[Span]:
+        span = Span(metric, labels, detail)
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except asyncio.CancelledError as e:
+            # Deliberate cancellations pass "cancelled" as the message; anything else is a deadline
+            span.outcome = span.outcome or ("cancelled" if e.args and e.args[0] == "cancelled" else "timeout")
+            raise
+        except Exception as e:
+            span.outcome = span.outcome or Metrics.classify(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            Metrics.record(metric, time.perf_counter() - started, span.outcome or "success", detail, **labels)
+
+    @staticmethod
+    def fail(error: Optional[BaseException] = None, outcome: Optional[str] = None) -> None:
+        """Mark the enclosing span as failed (or timed out, throttled, ...) after a handled error."""
+        span = _current_span.get()
+        if span is not None and span.outcome is None:
+            span.outcome = outcome or (Metrics.classify(error) if error is not None else "failure")
+
+    @staticmethod
+    def record(metric: str, seconds: float, outcome: str = "success", detail: Optional[str] = None, **labels: str) -> None:
+        """Observe a duration directly, for stages that can't be wrapped in a span."""
+        labels = {**labels, "outcome": outcome}
+        Metrics.observe(metric, seconds, **labels)
+        trace = _trace.get()
+        if trace is not None:
+            entry = {"metric": metric, **labels, "seconds": round(seconds, 6)}
+            if detail:
+                entry["detail"] = detail
+            trace.append(entry)
+
+    @staticmethod
+    def observe(metric: str, value: float, **labels: str) -> None:
+        key = (metric, tuple(str(labels.get(name, "")) for name in HISTOGRAMS[metric][2]))
+        with Metrics._lock:
+            series = Metrics._histograms.setdefault(key, [0.0] * (len(LATENCY_BUCKETS) + 2))
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @staticmethod
+    def inc(metric: str, amount: float = 1.0, **labels: str) -> None:
+        key = (metric, tuple(str(labels.get(name, "")) for name in COUNTERS[metric][2]))
+        with Metrics._lock:
+            Metrics._counters[key] = Metrics._counters.get(key, 0.0) + amount
+
+    @staticmethod
+    @contextmanager
+    def collect() -> Iterator[List[dict]]:
+        """Collect every span finished in this context (and tasks it starts) into a list."""
+        trace: List[dict] = []
+        token = _trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _trace.reset(token)
+
+    @staticmethod
+    def render() -> str:
+        """All series in the Prometheus text exposition format."""
+        with Metrics._lock:
+            histograms = {key: list(series) for key, series in Metrics._histograms.items()}
+            counters = dict(Metrics._counters)
+
+        lines = []
+        for metric, (name, help_text, label_names) in HISTOGRAMS.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for (series_metric, values), series in sorted(histograms.items()):
+                if series_metric != metric:
+                    continue
+                labels = Metrics._format_labels(label_names, values)
+                for bound, count in zip(LATENCY_BUCKETS, series):
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count:g}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {series[-1]:g}')
+                lines.append(f"{name}_sum{{{labels}}} {series[-2]:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {series[-1]:g}")
+        for metric, (name, help_text, label_names) in COUNTERS.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (series_metric, values), count in sorted(counters.items()):
+                if series_metric == metric:
+                    lines.append(f"{name}{{{Metrics._format_labels(label_names, values)}}} {count:g}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def reset() -> None:
+        with Metrics._lock:
+            Metrics._histograms.clear()
+            Metrics._counters.clear()
+
+    @staticmethod
+    def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+        def escape(value: str) -> str:
+            return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        return ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+
+    @staticmethod
+    def classify(error: BaseException) -> str:
+        if getattr(error, "outcome", None):
+            return error.outcome
+        # httpx costs ~100ms to import, so only load it once an error needs classifying
+        import httpx
+
+        if isinstance(error, (httpx.TimeoutException, asyncio.TimeoutError, TimeoutError)):
+            return "timeout"
+        return "failure"
@@ -0,0 +1,152 @@
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+MAX_HEADINGS = 3
+MAX_LINKS = 5
+HEADING_TAGS = ("h1", "h2", "h3")
+
+
+class PageSummary:
+    """
+    Incrementally collects the handful of fields ExtractionService needs from a
+    page: <title>, meta description, the first three h1-h3 headings, the first
+    <p> and the first five absolute links. `complete` turns true once every field
+    is settled, so callers can stop downloading and parsing early.
+    """
+
+    def __init__(self):
+        self.title: Optional[str] = None
+        self.meta_desc = ""
+        self.og_desc = ""
+        self.headings: List[str] = []
+        self.paragraph: Optional[str] = None
+        self.links: List[str] = []
+        self.head_done = False
+        self._capture_tag: Optional[str] = None
+        self._capture_parts: List[str] = []
+
+    @property
+    def complete(self) -> bool:
+        return (
+            self.head_done
+            and len(self.headings) >= MAX_HEADINGS
+            and self.paragraph is not None
+            and len(self.links) >= MAX_LINKS
+        )
+
+    @property
+    def description(self) -> str:
+        return self.meta_desc or self.og_desc
+
+    def start(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+        if tag == "body":
+            self.head_done = True
+        elif tag == "meta":
+            content = (attrs.get("content") or "").strip()
+            if content and attrs.get("name") == "description" and not self.meta_desc:
+                self.meta_desc = content
+            elif content and attrs.get("property") == "og:description" and not self.og_desc:
+                self.og_desc = content
+        elif tag == "a":
+            href = attrs.get("href") or ""
+            if href.startswith("http") and len(self.links) < MAX_LINKS:
+                self.links.append(href)
+
+        if self._capture_tag is None and self._wants(tag):
+            self._capture_tag = tag
+            self._capture_parts = []
+
+    def end(self, tag: str) -> None:
+        if tag == "head":
+            self.head_done = True
+        if tag != self._capture_tag:
+            return
+        text = "".join(part.strip() for part in self._capture_parts)
+        if tag == "title":
+            self.title = text
+        elif tag == "p":
+            self.paragraph = text
+        else:
+            self.headings.append(text)
+        self._capture_tag = None
+
+    def data(self, text: str) -> None:
+        if self._capture_tag is not None:
+            self._capture_parts.append(text)
+
+    def _wants(self, tag: str) -> bool:
+        if tag == "title":
+            return self.title is None
+        if tag == "p":
+            return self.paragraph is None
+        return tag in HEADING_TAGS and len(self.headings) < MAX_HEADINGS
+
+
+class _StdlibDriver(HTMLParser):
+    def __init__(self, summary: PageSummary):
+        super().__init__(convert_charrefs=True)
+        self.summary = summary
+
+    def handle_starttag(self, tag, attrs):
+        self.summary.start(tag, dict(attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self.summary.start(tag, dict(attrs))
+
+    def handle_endtag(self, tag):
+        self.summary.end(tag)
+
+    def handle_data(self, data):
+        self.summary.data(data)
+
+
+class _LxmlDriver:
+    def __init__(self, summary: PageSummary):
+        from lxml import etree
+
+        self.summary = summary
+        self._parser = etree.HTMLPullParser(events=("start", "end"))
+
+    def feed(self, chunk: str) -> None:
+        self._parser.feed(chunk)
+        self._drain()
+
+    def close(self) -> None:
+        try:
+            self._parser.close()
+        except Exception:
+            pass
+        self._drain()
+
+    def _drain(self) -> None:
+        for event, element in self._parser.read_events():
+            tag = element.tag if isinstance(element.tag, str) else ""
+            if event == "start":
+                self.summary.start(tag, dict(element.attrib))
+            else:
+                if tag == self.summary._capture_tag:
+                    for text in element.itertext():
+                        self.summary.data(text)
+                self.summary.end(tag)
+
+
+class PageSummaryParser:
+    """Feed decoded HTML chunks; uses lxml's pull parser when installed, else the stdlib parser."""
+
+    def __init__(self):
+        self.summary = PageSummary()
+        try:
+            self._driver = _LxmlDriver(self.summary)
+            self.backend = "lxml"
+        except ImportError:
+            self._driver = _StdlibDriver(self.summary)
+            self.backend = "html.parser"
+
+    def feed(self, chunk: str) -> bool:
+        """Parse another chunk; returns True once every field has been collected."""
+        self._driver.feed(chunk)
+        return self.summary.complete
+
+    def close(self) -> PageSummary:
+        self._driver.close()
+        return self.summary
@@ -0,0 +1,183 @@
+import time
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Mapping, Optional
+from config.settings import settings
+from .metrics import Metrics
+
+THROTTLE_STATUSES = (429, 503)
+# How often a caller waiting for a concurrency slot looks again
+POLL_SECONDS = 0.02
+# Bot checks (reCAPTCHA, hCaptcha, Turnstile, Cloudflare/DataDome/PerimeterX challenges),
+# looked for in the first BLOCK_SNIFF_CHARS of a page
+CAPTCHA_MARKERS = (
+    "g-recaptcha", "h-captcha", "cf-turnstile", "/cdn-cgi/challenge-platform/", "cf-chl-",
+    "<title>just a moment", "captcha-delivery.com", "px-captcha",
+)
+# Block interstitials served with a 403 (Cloudflare, Akamai and other WAFs)
+BLOCK_MARKERS = ("<title>attention required", "<title>access denied", "cloudflare ray id", "request blocked")
+BLOCK_SNIFF_CHARS = 8192
+
+
+class RateLimitedError(Exception):
+    """Raised instead of waiting longer than RATE_LIMIT_MAX_WAIT_SECONDS for a host."""
+
+    outcome = "throttled"
+
+
+class BlockedPageError(Exception):
+    """Raised when a fetched page is a CAPTCHA or block interstitial rather than content."""
+
+    outcome = "throttled"
+
+
+class _HostState:
+    def __init__(self):
+        self.rate = settings.RATE_LIMIT_INITIAL_RATE
+        self.tokens = float(settings.RATE_LIMIT_BURST)
+        self.updated = time.monotonic()
+        self.concurrency = float(settings.RATE_LIMIT_INITIAL_CONCURRENCY)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.healthy = 0
+        self.throttled = 0
+
+    def try_acquire(self, now: float) -> float:
+        """Take a token and a concurrency slot, or return how long to wait before trying again."""
+        self.tokens = min(float(settings.RATE_LIMIT_BURST), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.in_flight >= int(self.concurrency):
+            return POLL_SECONDS
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        self.tokens -= 1
+        self.in_flight += 1
+        return 0.0
+
+
+class HostRateLimiter:
+    """
+    Per-host token bucket plus concurrency limit, shared by every event loop and
+    worker thread (SearchService and ExtractionService both go through HttpClient).
+
+    Limits adapt AIMD-style: each healthy response adds RATE_LIMIT_INCREASE
+    requests/second (and grows the concurrency limit by about one slot per
+    window of responses); a 429/503 or a soft block reported by the caller
+    (see block_reason) multiplies both by RATE_LIMIT_DECREASE, and a Retry-After header pauses the
+    host until it has passed. Callers that would wait longer than
+    RATE_LIMIT_MAX_WAIT_SECONDS get RateLimitedError so they can fall back.
+    """
+
+    _hosts: Dict[str, _HostState] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    @asynccontextmanager
+    async def slot(host: str) -> AsyncIterator[None]:
+        """Hold one request's token and concurrency slot for `host`."""
+        if not settings.RATE_LIMIT_ENABLED:
+            yield
+            return
+        deadline = time.monotonic() + settings.RATE_LIMIT_MAX_WAIT_SECONDS
+        while True:
+            now = time.monotonic()
+            with HostRateLimiter._lock:
+                wait = HostRateLimiter._state(host).try_acquire(now)
+            if wait == 0:
+                break
+            if now + wait > deadline:
+                Metrics.inc("rate_limited_requests", host=host)
+                raise RateLimitedError(f"{host} is rate limited; would wait {wait:.1f}s")
+            await asyncio.sleep(wait)
+        try:
+            yield
+        finally:
+            with HostRateLimiter._lock:
+                HostRateLimiter._state(host).in_flight -= 1
+
+    @staticmethod
+    def record(host: str, status_code: int, retry_after: Optional[str] = None) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        if status_code in THROTTLE_STATUSES:
+            HostRateLimiter.throttle(host, retry_after, reason=str(status_code))
+        elif status_code < 500:
+            with HostRateLimiter._lock:
+                state = HostRateLimiter._state(host)
+                state.healthy += 1
+                state.rate = min(settings.RATE_LIMIT_MAX_RATE, state.rate + settings.RATE_LIMIT_INCREASE)
+                state.concurrency = min(
+                    float(settings.RATE_LIMIT_MAX_CONCURRENCY), state.concurrency + 1 / state.concurrency
+                )
+
+    @staticmethod
+    def throttle(host: str, retry_after: Optional[str] = None, reason: str = "blocked") -> None:
+        """Back off from `host`: a 429/503, or a CAPTCHA/anomaly page the caller detected."""
+        pause = HostRateLimiter._parse_retry_after(retry_after)
+        with HostRateLimiter._lock:
+            state = HostRateLimiter._state(host)
+            state.throttled += 1
+            state.rate = max(settings.RATE_LIMIT_MIN_RATE, state.rate * settings.RATE_LIMIT_DECREASE)
+            state.concurrency = max(1.0, state.concurrency * settings.RATE_LIMIT_DECREASE)
+            state.tokens = min(state.tokens, 0.0)
+            if pause:
+                state.blocked_until = max(state.blocked_until, time.monotonic() + pause)
+        Metrics.inc("throttled_responses", host=host, reason=reason)
+
+    @staticmethod
+    def block_reason(status_code: int, headers: Mapping[str, str], head: str) -> Optional[str]:
+        """
+        "captcha" or "blocked" when a 200/403 response is a bot check or WAF
+        interstitial (judged by its headers and `head`, the start of the body),
+        else None. A plain 403 without such markers isn't a block.
+        """
+        if status_code not in (200, 403):
+            return None
+        head = head[:BLOCK_SNIFF_CHARS].lower()
+        if headers.get("cf-mitigated") == "challenge" or any(marker in head for marker in CAPTCHA_MARKERS):
+            return "captcha"
+        if status_code == 403 and any(marker in head for marker in BLOCK_MARKERS):
+            return "blocked"
+        return None
+
+    @staticmethod
+    def stats() -> Dict[str, Dict[str, Any]]:
+        """Current per-host rate (requests/second), concurrency limit and counters."""
+        now = time.monotonic()
+        with HostRateLimiter._lock:
+            return {
+                host: {
+                    "rate": round(state.rate, 3),
+                    "concurrency": int(state.concurrency),
+                    "in_flight": state.in_flight,
+                    "blocked_for_seconds": round(max(0.0, state.blocked_until - now), 3),
+                    "healthy_responses": state.healthy,
+                    "throttled_responses": state.throttled,
+                }
+                for host, state in HostRateLimiter._hosts.items()
+            }
+
+    @staticmethod
+    def _state(host: str) -> _HostState:
+        state = HostRateLimiter._hosts.get(host)
+        if state is None:
+            state = HostRateLimiter._hosts[host] = _HostState()
+        return state
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> float:
+        """Retry-After as seconds (delta-seconds or an HTTP date), capped at RATE_LIMIT_MAX_RETRY_AFTER."""
+        if not value:
+            return 0.0
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                seconds = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return 0.0
+        return min(max(0.0, seconds), settings.RATE_LIMIT_MAX_RETRY_AFTER)
@@ -0,0 +1,93 @@
+import re
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from config.settings import settings
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "i", "in", "is", "it", "of", "on",
+    "or", "that", "the", "this", "to", "we", "with", "who", "what", "looking", "need", "needs", "needing",
+    "find", "people", "person", "someone", "want", "wants", "com", "www", "https", "http",
+}
+WORD_PATTERN = re.compile(r"[^\W_]+")
+# Fields a lead is matched on, and how many times each one counts
+FIELD_WEIGHTS = {"Title": 2, "Bio": 1, "Username": 1, "Source": 1, "Website URL": 1}
+
+
+class RelevanceRanker:
+    """
+    Local BM25 relevance of lead rows to the user query and company description.
+
+    All rows of a request are scored together: document frequencies come from
+    the batch itself, so terms every lead shares count for little. Scores are
+    scaled to 0-100 against the best score the query terms could reach, which
+    keeps them comparable with the confidence score. Because they depend on the
+    whole batch, leads streamed before the final ranking carry no score. No
+    network or LLM calls are involved.
+    """
+
+    @staticmethod
+    def score(rows: List[dict], texts: List[str]) -> List[int]:
+        query = Counter(term for text in texts if text for term in RelevanceRanker.tokenize(text))
+        if not rows or not query:
+            return [0] * len(rows)
+
+        # Only query-term counts and document lengths matter to BM25
+        documents, lengths = zip(*(RelevanceRanker._document(row, query) for row in rows))
+        average_length = (sum(lengths) / len(lengths)) or 1.0
+        document_frequency: Dict[str, int] = Counter(term for document in documents for term in query if term in document)
+        k1, b = settings.RERANK_BM25_K1, settings.RERANK_BM25_B
+        idf = {
+            term: math.log(1 + (len(documents) - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+            for term in query
+        }
+        best = sum(weight * idf[term] * (k1 + 1) for term, weight in query.items())
+
+        scores = []
+        for document, length in zip(documents, lengths):
+            norm = k1 * (1 - b + b * length / average_length)
+            total = 0.0
+            for term, weight in query.items():
+                frequency = document.get(term)
+                if frequency:
+                    total += weight * idf[term] * frequency * (k1 + 1) / (frequency + norm)
+            scores.append(round(100 * total / best) if best else 0)
+        return scores
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        stem = RelevanceRanker._stem
+        return [stem(word) for word in WORD_PATTERN.findall(text.lower()) if word not in STOPWORDS and len(word) > 1]
+
+    @staticmethod
+    def _document(row: dict, query: Counter) -> Tuple[Dict[str, int], int]:
+        """(weighted counts of the query terms in the row, weighted row length in terms)."""
+        counts: Dict[str, int] = {}
+        length = 0
+        for field, weight in FIELD_WEIGHTS.items():
+            value = row.get(field)
+            if not value:
+                continue
+            tokens = RelevanceRanker.tokenize(str(value))
+            length += weight * len(tokens)
+            for token in tokens:
+                if token in query:
+                    counts[token] = counts.get(token, 0) + weight
+        return counts, length
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def _stem(word: str) -> str:
+        """Light suffix stripping so "chatbots"/"chatbot" and "cloning"/"clone" meet."""
+        if len(word) > 4 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif len(word) > 5 and word.endswith("ing"):
+            word = word[:-3]
+        elif len(word) > 4 and word.endswith("ed"):
+            word = word[:-2]
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        if len(word) > 4 and word.endswith("e"):
+            word = word[:-1]
+        return word
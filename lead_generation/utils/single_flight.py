@@ -0,0 +1,89 @@
+import copy
+import asyncio
+import threading
+import concurrent.futures
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+from config.settings import settings
+from .metrics import Metrics
+
+
+class FlightAbandoned(Exception):
+    """The call being waited on was cancelled before it produced a result."""
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key onto one running computation.
+
+    The first caller (the leader) runs the work; callers arriving while it is in
+    flight wait for its result instead of starting their own. Results are shared
+    through thread-safe futures, so this also works across the per-request event
+    loops of the sync wrappers and the job workers. Followers get a deep copy of
+    the result; if the leader is cancelled they run the work themselves. Nothing
+    is kept once the call finishes: reuse after that is the caches' job.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    async def do(self, key: Hashable, work: Callable[[], Awaitable[Any]]) -> Any:
+        if not settings.SINGLE_FLIGHT_ENABLED:
+            return await work()
+        future, leader = self.claim(key)
+        if not leader:
+            try:
+                return await self.wait(future)
+            except FlightAbandoned:
+                return await work()
+        try:
+            result = await work()
+        except BaseException as e:
+            self.release(key, future, None if isinstance(e, asyncio.CancelledError) else e)
+            raise
+        self.resolve(key, future, result)
+        return result
+
+    def claim(self, key: Hashable) -> Tuple[concurrent.futures.Future, bool]:
+        """Return (future, True) if the caller should run the work, else the in-flight future and False."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                Metrics.inc("coalesced_calls", level=self.name)
+                return future, False
+            future = self._calls[key] = concurrent.futures.Future()
+            return future, True
+
+    def resolve(self, key: Hashable, future: concurrent.futures.Future, result: Any) -> None:
+        self._forget(key, future)
+        if not future.done():
+            future.set_result(result)
+
+    def release(self, key: Hashable, future: concurrent.futures.Future, error: BaseException = None) -> None:
+        """Finish a claimed call without a result: followers see `error`, or run the work themselves."""
+        self._forget(key, future)
+        if not future.done():
+            if error is None:
+                future.cancel()
+            else:
+                future.set_exception(error)
+
+    async def wait(self, future: concurrent.futures.Future) -> Any:
+        # shield: a follower being cancelled must not cancel the shared future
+        try:
+            result = await asyncio.shield(asyncio.wrap_future(future))
+        except asyncio.CancelledError:
+            if future.cancelled():
+                raise FlightAbandoned() from None
+            raise
+        return copy.deepcopy(result)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def _forget(self, key: Hashable, future: concurrent.futures.Future) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
@@ -0,0 +1,217 @@
+import re
+import html
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+
+# Platform -> canonical host; every host in PLATFORM_HOSTS maps onto one of these
+CANONICAL_HOSTS = {
+    "linkedin": "www.linkedin.com",
+    "reddit": "www.reddit.com",
+    "twitter": "twitter.com",
+    "github": "github.com",
+    "stackoverflow": "stackoverflow.com",
+    "quora": "www.quora.com",
+}
+PLATFORM_HOSTS = {
+    "linkedin.com": "linkedin",
+    "reddit.com": "reddit",
+    "twitter.com": "twitter",
+    "x.com": "twitter",
+    "github.com": "github",
+    "stackoverflow.com": "stackoverflow",
+    "quora.com": "quora",
+}
+# Subdomains that serve the same pages as the platform's canonical host (LinkedIn also has
+# two-letter country ones: uk.linkedin.com/in/...). Any other subdomain (gist.github.com,
+# meta.stackoverflow.com, es.quora.com, ...) is a separate site.
+PLATFORM_MIRRORS = {
+    "linkedin": {"www", "m", "mobile"},
+    "reddit": {"www", "old", "new", "np", "m", "i"},
+    "twitter": {"www", "m", "mobile"},
+    "github": {"www"},
+    "stackoverflow": {"www"},
+    "quora": {"www", "m"},
+}
+
+TRACKING_PARAMS = {"fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "igshid", "ref_src", "ref_url", "trk", "trkinfo", "share", "si"}
+DUCKDUCKGO_LEFTOVER_PARAMS = {"rut", "uddg"}
+# Share and referral parameters per platform; every other parameter (?q=, ?keywords=, ...) is kept
+PLATFORM_TRACKING_PARAMS = {
+    "linkedin": {"trackingid", "refid", "lipi", "licu", "midtoken", "midsig", "original_referer", "rcm", "lici", "ref"},
+    "reddit": {"share_id", "rdt", "ref", "ref_source"},
+    "twitter": {"s", "t", "ref"},
+    "github": set(),
+    "stackoverflow": {"rq", "ref"},
+    "quora": {"ch", "srid", "ref"},
+}
+
+
+class UrlCanonicalizer:
+    """
+    Normalize search-result URLs so equivalent variants are fetched once.
+
+    canonicalize() returns the URL to fetch: DuckDuckGo redirects unwrapped,
+    fragments and tracking parameters dropped, and for LinkedIn, Reddit,
+    Twitter/X, GitHub, StackOverflow and Quora the canonical https host and a
+    trimmed path. key() is a looser identity for comparing two URLs (scheme,
+    www. and trailing slashes ignored; Reddit, Twitter and StackOverflow posts
+    keyed by their id alone). Only a platform's known mirror hosts
+    (old.reddit.com, mobile.twitter.com, ...) are folded into its canonical
+    host; other sites keep every subdomain but www.
+    """
+
+    @staticmethod
+    def canonicalize(url: str) -> str:
+        url = UrlCanonicalizer._unwrap_redirect(html.unescape(url.strip()))
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            return url
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            return url
+
+        host = parts.hostname.lower()
+        port = f":{parts.port}" if parts.port and parts.port not in (80, 443) else ""
+        query = [
+            (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not name.lower().startswith("utm_")
+            and name.lower() not in TRACKING_PARAMS
+            and name.lower() not in DUCKDUCKGO_LEFTOVER_PARAMS
+        ]
+        path = re.sub(r"/{2,}", "/", parts.path) or "/"
+
+        platform = UrlCanonicalizer.platform(host)
+        if platform is None:
+            if len(path) > 1:
+                path = path.rstrip("/")
+            return urlunsplit((parts.scheme, host + port, path, urlencode(query), ""))
+
+        path, query = UrlCanonicalizer._normalize_platform_path(platform, path, query)
+        return urlunsplit(("https", CANONICAL_HOSTS[platform], path, urlencode(query), ""))
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Identity used to collapse equivalent URLs."""
+        canonical = UrlCanonicalizer.canonicalize(url)
+        parts = urlsplit(canonical)
+        host = (parts.hostname or "").lower()
+        if host.startswith("www.") and host.count(".") >= 2:
+            host = host[len("www."):]
+        path = parts.path.rstrip("/")
+        platform = UrlCanonicalizer.platform(host)
+        post_id = UrlCanonicalizer._post_id(platform, path) if platform else None
+        if post_id:
+            return f"{platform}:{post_id}"
+        query = "&".join(sorted(parts.query.split("&"))) if parts.query else ""
+        return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+    @staticmethod
+    def collapse(urls: List[str]) -> Tuple[List[str], int]:
+        """
+        Canonicalize and drop equivalent URLs, keeping first-seen order.
+        Returns (unique canonical URLs, number of variants collapsed beyond exact duplicates).
+        """
+        unique: Dict[str, str] = {}
+        exact = set()
+        for url in urls:
+            if not url:
+                continue
+            exact.add(url)
+            unique.setdefault(UrlCanonicalizer.key(url), UrlCanonicalizer.canonicalize(url))
+        return list(unique.values()), len(exact) - len(unique)
+
+    @staticmethod
+    def platform(host: str) -> Optional[str]:
+        host = host.lower()
+        for suffix, platform in PLATFORM_HOSTS.items():
+            if host == suffix:
+                return platform
+            if host.endswith("." + suffix):
+                subdomain = host[:-len(suffix) - 1]
+                if subdomain in PLATFORM_MIRRORS[platform]:
+                    return platform
+                if platform == "linkedin" and re.fullmatch(r"[a-z]{2}", subdomain):
+                    return platform
+                return None
+        return None
+
+    @staticmethod
+    def _unwrap_redirect(url: str) -> str:
+        """Follow DuckDuckGo's /l/?uddg= redirect wrapper to the real target."""
+        if "duckduckgo.com/l/" in url and "uddg=" in url:
+            target = parse_qs(urlsplit(url if "://" in url else "https:" + url).query).get("uddg", [None])[0]
+            if target:
+                return unquote(target)
+        return url
+
+    @staticmethod
+    def _normalize_platform_path(platform: str, path: str, query: List[Tuple[str, str]]) -> Tuple[str, List[Tuple[str, str]]]:
+        """
+        Canonical path for a platform URL. Profile, post and question pages are
+        identified by their path alone, so their query is dropped; elsewhere
+        (search pages, listings) only the platform's share/referral parameters go.
+        """
+        segments = [segment for segment in path.split("/") if segment]
+        lowered = [segment.lower() for segment in segments]
+        tracking = PLATFORM_TRACKING_PARAMS[platform]
+        query = [(name, value) for name, value in query if name.lower() not in tracking]
+
+        if platform == "linkedin":
+            # Profiles and company pages: /in/<slug>, /company/<slug> (sub-pages and query dropped)
+            if len(segments) >= 2 and lowered[0] in ("in", "company", "school", "showcase"):
+                return f"/{lowered[0]}/{lowered[1]}", []
+            return "/" + "/".join(segments), query
+
+        if platform == "reddit":
+            if len(segments) >= 2 and lowered[0] == "u":
+                lowered[0] = "user"
+            if len(segments) >= 2 and lowered[0] in ("r", "user"):
+                segments = [lowered[0], lowered[1], *segments[2:]]
+            if "comments" in lowered:
+                return "/" + "/".join(segments), []
+            return "/" + "/".join(segments), query
+
+        if platform == "twitter":
+            # /<handle>/status/<id>/photo/1 -> /<handle>/status/<id>; /i/web/status/<id> kept as is
+            if "status" in lowered:
+                position = lowered.index("status")
+                if position + 1 < len(segments):
+                    handle = lowered[0] if position >= 1 else "i"
+                    prefix = "/i/web" if handle == "i" else f"/{handle}"
+                    return f"{prefix}/status/{segments[position + 1]}", []
+            if len(segments) == 1:
+                # A profile, unless it's the search page
+                return f"/{lowered[0]}", query if lowered[0] == "search" else []
+            return "/" + "/".join(segments), query
+
+        if platform == "github":
+            # Owner and repository names are case-insensitive; .git clone URLs point at the repo
+            if segments:
+                segments[0] = lowered[0]
+            if len(segments) >= 2:
+                segments[1] = re.sub(r"\.git$", "", lowered[1])
+            return "/" + "/".join(segments), query
+
+        if platform == "stackoverflow":
+            if len(segments) >= 2 and lowered[0] == "q":
+                return f"/questions/{segments[1]}", []
+            if len(segments) >= 2 and lowered[0] == "questions" and segments[1].isdigit():
+                return "/" + "/".join(segments[:3]), []
+            return "/" + "/".join(segments), query
+
+        # quora
+        return "/" + "/".join(segments), query
+
+    @staticmethod
+    def _post_id(platform: str, path: str) -> Optional[str]:
+        lowered = path.lower()
+        if platform == "reddit":
+            match = re.search(r"/comments/([a-z0-9]+)(?:/[^/]*)?$", lowered)
+            return f"comments/{match.group(1)}" if match else None
+        if platform == "twitter":
+            match = re.search(r"/status/(\d+)$", lowered)
+            return f"status/{match.group(1)}" if match else None
+        if platform == "stackoverflow":
+            match = re.search(r"^/questions/(\d+)", lowered)
+            return f"questions/{match.group(1)}" if match else None
+        return None
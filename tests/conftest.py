@@ -0,0 +1,35 @@
+import os
+import sys
+import asyncio
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lead_generation.utils.circuit_breaker import CircuitBreaker  # noqa: E402
+from lead_generation.utils.http_client import HttpClient  # noqa: E402
+from lead_generation.utils.rate_limiter import HostRateLimiter  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_host_state():
+    """Circuit breakers and per-host rate limits are process-wide; start every test from scratch."""
+    CircuitBreaker._breakers.clear()
+    HostRateLimiter._hosts.clear()
+    yield
+    CircuitBreaker._breakers.clear()
+    HostRateLimiter._hosts.clear()
+
+
+@pytest.fixture
+def run_offline():
+    """Run `coroutine_fn()` on a fresh loop whose pooled HTTP client is answered by `handler(request)`."""
+    def run(coroutine_fn, handler):
+        async def main():
+            HttpClient._clients[asyncio.get_running_loop()] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            return await coroutine_fn()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+from config.settings import settings
+from lead_generation.utils.circuit_breaker import CircuitBreaker
+from lead_generation.utils.rate_limiter import RateLimitedError
+
+
+def call(breaker: CircuitBreaker, error: Exception) -> None:
+    with pytest.raises(type(error)):
+        with breaker.guard():
+            raise error
+
+
+def test_failures_open_the_circuit():
+    breaker = CircuitBreaker.get("endpoint")
+    for _ in range(settings.CIRCUIT_MIN_CALLS):
+        call(breaker, RuntimeError("boom"))
+    assert breaker.state == "open"
+
+
+@pytest.mark.parametrize("error", [RateLimitedError("slow down"), asyncio.CancelledError()], ids=["rate-limited", "cancelled"])
+def test_calls_that_never_reached_the_endpoint_are_not_recorded(error):
+    breaker = CircuitBreaker.get("endpoint")
+    for _ in range(settings.CIRCUIT_MIN_CALLS * 2):
+        call(breaker, error)
+    snapshot = breaker.snapshot()
+    assert snapshot["state"] == "closed"
+    assert snapshot["window_calls"] == 0
@@ -0,0 +1,25 @@
+import threading
+
+import pytest
+
+from lead_generation.jobs import JobManager, JobQueueFullError
+
+
+def test_submit_refuses_jobs_beyond_max_pending(monkeypatch):
+    release = threading.Event()
+
+    def run(self, job):
+        release.wait(5)
+        job.set_status("completed", "done")
+
+    monkeypatch.setattr(JobManager, "_run", run)
+    manager = JobManager(max_workers=1, max_retained=10, max_pending=2)
+    # One running, one queued behind it
+    jobs = [manager.submit("crm for shops", 3) for _ in range(2)]
+    with pytest.raises(JobQueueFullError):
+        manager.submit("crm for shops", 3)
+
+    release.set()
+    for job in jobs:
+        job.future.result(5)
+    assert manager.submit("crm for shops", 3).future.result(5) is None
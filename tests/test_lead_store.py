@@ -0,0 +1,58 @@
+import time
+import sqlite3
+import threading
+
+from lead_generation.lead_store import LeadStore
+
+
+def lead(username: str) -> dict:
+    return {
+        "Website URL": "https://www.reddit.com/r/saas/comments/abc123",
+        "Username": username,
+        "Title": "Looking for a CRM for a small shop",
+        "Bio": "We outgrew spreadsheets",
+        "Source": "reddit",
+        "Confidence": "high",
+        "Confidence Score": 80,
+        "Relevance Score": 40,
+    }
+
+
+def test_upsert_and_search(tmp_path):
+    store = LeadStore(str(tmp_path / "leads.sqlite"))
+    assert store.upsert([lead("alice"), lead("bob")], "crm for shops") == 2
+    assert store.upsert([lead("alice")]) == 1
+    assert store.count() == 2
+    assert store.search("crm")["total"] == 2
+
+
+def test_concurrent_first_use_waits_for_the_connection(tmp_path, monkeypatch):
+    """A caller arriving while another thread opens the database must not get None and drop its rows."""
+    connect = sqlite3.connect
+    opening = threading.Event()
+
+    def slow_connect(*args, **kwargs):
+        opening.set()
+        time.sleep(0.2)
+        return connect(*args, **kwargs)
+
+    monkeypatch.setattr(sqlite3, "connect", slow_connect)
+    store = LeadStore(str(tmp_path / "leads.sqlite"))
+    # e.g. the WARMUP_ON_STARTUP thread opening the store ...
+    warm_up = threading.Thread(target=store.count)
+    warm_up.start()
+    assert opening.wait(5)
+    # ... while a request stores its leads
+    written = store.upsert([lead("alice")], "crm for shops")
+    warm_up.join()
+
+    assert written == 1
+    assert store.count() == 1
+
+
+def test_unavailable_store_is_disabled(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    store = LeadStore(str(blocker / "leads.sqlite"))
+    assert store.upsert([lead("alice")]) == 0
+    assert store.count() == 0
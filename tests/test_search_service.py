@@ -0,0 +1,118 @@
+import time
+import asyncio
+
+import httpx
+import pytest
+
+from config.settings import settings
+from lead_generation.services.search_service import SearchService
+from lead_generation.utils.circuit_breaker import CircuitBreaker
+from lead_generation.utils.http_client import HttpClient
+from lead_generation.utils.metrics import Metrics
+from lead_generation.utils.rate_limiter import HostRateLimiter
+
+RESULTS_PAGE = """
+<a class="result__a" href="https://www.quora.com/What-CRM-should-a-small-shop-use">CRM</a>
+<a class="result__a" href="https://www.linkedin.com/posts/crm-for-shops">CRM</a>
+<a class="result__a" href="https://example.com/crm-buyers-guide">CRM</a>
+"""
+# DuckDuckGo's anomaly (CAPTCHA) page: status 200, with links of its own
+ANOMALY_PAGE = """
+<div class="anomaly-modal__title">Unfortunately, bots use DuckDuckGo too.</div>
+<a href="https://duckduckgo.com/about">About</a>
+<a href="https://help.duckduckgo.com/privacy">Privacy</a>
+<a href="https://www.quora.com/profile/DuckDuckGo">Quora</a>
+<a href="https://www.linkedin.com/company/duck-duck-go">LinkedIn</a>
+"""
+
+SEARCHES = {
+    "generic": lambda: SearchService._search_duckduckgo_generic("crm for shops", 5),
+    "quora": lambda: SearchService._search_duckduckgo("crm for shops", 5),
+    "linkedin": lambda: SearchService._search_duckduckgo_site("crm for shops", 5, "linkedin.com"),
+}
+
+
+def page(status: int, body: str):
+    return lambda request: httpx.Response(status, text=body, headers={"content-type": "text/html"})
+
+
+@pytest.mark.parametrize("source", SEARCHES)
+def test_results_page_is_parsed(run_offline, source):
+    assert run_offline(SEARCHES[source], page(200, RESULTS_PAGE))
+
+
+@pytest.mark.parametrize("source", SEARCHES)
+@pytest.mark.parametrize("status, body", [(200, ANOMALY_PAGE), (202, "")], ids=["anomaly-page", "202"])
+def test_soft_block_yields_no_urls_and_backs_off(run_offline, source, status, body):
+    async def search():
+        with Metrics.span("search_source", source=source) as span:
+            urls = await SEARCHES[source]()
+        return urls, span.outcome
+
+    urls, outcome = run_offline(search, page(status, body))
+
+    assert urls == []
+    assert outcome == "throttled"
+    throttled = [stats["throttled_responses"] for stats in HostRateLimiter.stats().values()]
+    assert throttled == [1]
+    assert CircuitBreaker.get("duckduckgo").snapshot()["window_failures"] == 1
+
+
+def test_rate_limited_search_does_not_trip_the_breaker(run_offline):
+    # Paused by an earlier Retry-After: every call gives up in our own limiter without a request going out
+    HostRateLimiter.throttle(HttpClient.rate_key(settings.DUCKDUCKGO_HTML_URL), retry_after="600")
+
+    async def search():
+        outcomes = []
+        for _ in range(settings.CIRCUIT_MIN_CALLS * 2):
+            with Metrics.span("search_source", source="generic") as span:
+                assert await SEARCHES["generic"]() == []
+            outcomes.append(span.outcome)
+        return outcomes
+
+    outcomes = run_offline(search, page(200, RESULTS_PAGE))
+
+    assert set(outcomes) == {"throttled"}
+    breaker = CircuitBreaker.get("duckduckgo").snapshot()
+    assert breaker["state"] == "closed"
+    assert breaker["window_failures"] == 0
+
+
+def stale_entry(monkeypatch, source: str) -> tuple:
+    key = (SearchService._normalize_description("crm for shops"), source, 5)
+    SearchService._result_cache.set(key, ["https://example.com/old"])
+    clock = time.time
+    monkeypatch.setattr(time, "time", lambda: clock() + settings.SEARCH_CACHE_TTL_SECONDS + 1)
+    return key
+
+
+def test_stale_refresh_finishes_under_run_sync(monkeypatch):
+    key = stale_entry(monkeypatch, "refresh-test")
+
+    async def search():
+        await asyncio.sleep(0.05)
+        return ["https://example.com/new"]
+
+    urls = HttpClient.run_sync(SearchService._cached_search("refresh-test", "crm for shops", 5, search))
+
+    assert urls == ["https://example.com/old"]
+    # The refresh outlived the call that started it but not run_sync's loop
+    assert SearchService._result_cache.get(key) == ["https://example.com/new"]
+    assert key not in SearchService._refreshing
+
+
+def test_stale_refresh_under_run_sync_is_bounded_by_the_search_deadline(monkeypatch):
+    key = stale_entry(monkeypatch, "slow-refresh-test")
+    monkeypatch.setattr(settings, "SEARCH_DEADLINE_SECONDS", 0.05)
+
+    async def search():
+        await asyncio.sleep(5)
+        return ["https://example.com/new"]
+
+    started = time.perf_counter()
+    urls = HttpClient.run_sync(SearchService._cached_search("slow-refresh-test", "crm for shops", 5, search))
+
+    assert urls == ["https://example.com/old"]
+    assert time.perf_counter() - started < 1
+    assert SearchService._result_cache.get(key) == ["https://example.com/old"]
+    assert key not in SearchService._refreshing
@@ -0,0 +1,54 @@
+import pytest
+
+from lead_generation.utils.url_canonicalizer import UrlCanonicalizer
+
+key = UrlCanonicalizer.key
+
+
+@pytest.mark.parametrize("a, b", [
+    ("https://old.reddit.com/r/SaaS/comments/abc123/need_a_crm/", "https://www.reddit.com/r/saas/comments/abc123"),
+    ("https://np.reddit.com/r/SaaS/comments/abc123/", "https://reddit.com/comments/abc123"),
+    ("https://mobile.twitter.com/acme/status/42?s=20", "https://x.com/acme/status/42"),
+    ("https://m.twitter.com/acme", "https://twitter.com/acme/"),
+    ("https://uk.linkedin.com/in/jane-doe?trk=public", "https://www.linkedin.com/in/Jane-Doe/details"),
+    ("https://m.quora.com/What-CRM-should-I-use", "https://www.quora.com/What-CRM-should-I-use"),
+    ("https://stackoverflow.com/q/123", "https://stackoverflow.com/questions/123/some-title"),
+    ("https://www.example.com/about/", "http://example.com/about"),
+    ("https://example.com/page?b=2&a=1&utm_source=x", "https://example.com/page?a=1&b=2"),
+])
+def test_equivalent_urls_share_a_key(a, b):
+    assert key(a) == key(b)
+
+
+@pytest.mark.parametrize("a, b", [
+    # Mirror-looking subdomains of other sites are different sites
+    ("https://new.example.com/about", "https://example.com/about"),
+    ("https://i.imgur.com/abc.png", "https://imgur.com/abc.png"),
+    ("https://m.example.com/", "https://example.com/"),
+    ("https://mobile.example.org/pricing", "https://example.org/pricing"),
+    # ... and so are non-mirror subdomains of the platforms
+    ("https://gist.github.com/acme/abc", "https://github.com/acme/abc"),
+    ("https://meta.stackoverflow.com/questions/1", "https://stackoverflow.com/questions/1"),
+    ("https://es.quora.com/Que-CRM-usar", "https://www.quora.com/Que-CRM-usar"),
+    # Query parameters that select content are kept
+    ("https://www.quora.com/search?q=crm", "https://www.quora.com/search?q=erp"),
+    ("https://twitter.com/search?q=crm", "https://twitter.com/search?q=erp"),
+])
+def test_different_pages_keep_distinct_keys(a, b):
+    assert key(a) != key(b)
+
+
+def test_collapse_counts_only_equivalent_variants():
+    urls, collapsed = UrlCanonicalizer.collapse([
+        "https://old.reddit.com/r/SaaS/comments/abc123/x/",
+        "https://www.reddit.com/r/SaaS/comments/abc123/x/",
+        "https://www.reddit.com/r/SaaS/comments/abc123/x/",
+        "https://new.example.com/about",
+        "https://example.com/about",
+    ])
+    assert urls == [
+        "https://www.reddit.com/r/saas/comments/abc123/x",
+        "https://new.example.com/about",
+        "https://example.com/about",
+    ]
+    assert collapsed == 1